@@ -4,7 +4,7 @@ Batch import verified cooperatives into the website.
 
 This script:
 1. Reads newly verified cooperatives from labeled_data.json
-2. Captures screenshots using Puppeteer
+2. Captures screenshots using the shared Puppeteer worker
 3. Updates index.html with new cooperative entries
 4. Marks cooperatives as exported
 
@@ -18,11 +18,14 @@ Options:
 
 import json
 import argparse
-import subprocess
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
+from batch_import_all import start_screenshot_worker
+from coop_utils import load_json, normalize_url, save_json
+
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 ML_PIPELINE_DIR = Path(__file__).parent.parent
@@ -31,17 +34,8 @@ LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 INDEX_HTML_PATH = PROJECT_ROOT / "index.html"
 SCREENSHOTS_DIR = PROJECT_ROOT / "screenshots"
 
-
-def load_json(path):
-    """Load JSON file."""
-    with open(path, 'r') as f:
-        return json.load(f)
-
-
-def save_json(data, path):
-    """Save JSON file with pretty formatting."""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+# Cooperative entry ids in index.html
+ID_PATTERN = re.compile(r'\{\s*id:\s*(\d+)')
 
 
 def get_exportable_cooperatives(labeled_data, min_score=0.5):
@@ -59,74 +53,10 @@ def get_exportable_cooperatives(labeled_data, min_score=0.5):
     return exportable
 
 
-def capture_screenshot(coop, screenshots_dir):
-    """Capture screenshot for a cooperative using Node.js script."""
-    # Create a temporary script to capture single screenshot
-    script = f"""
-const puppeteer = require('puppeteer');
-
-async function capture() {{
-    const browser = await puppeteer.launch({{
-        headless: true,
-        channel: 'chrome',
-        args: ['--no-sandbox', '--disable-setuid-sandbox']
-    }});
-
-    const page = await browser.newPage();
-    await page.setViewport({{ width: 1280, height: 800 }});
-    await page.setUserAgent('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36');
-
-    try {{
-        await page.goto('{coop["website"]}', {{
-            waitUntil: 'networkidle2',
-            timeout: 30000
-        }});
-        await page.waitForTimeout(2000);
-
-        const filename = '{coop["id"]}.png';
-        await page.screenshot({{
-            path: '{screenshots_dir}/' + filename,
-            fullPage: false
-        }});
-        console.log('SUCCESS: ' + filename);
-    }} catch (error) {{
-        console.log('ERROR: ' + error.message);
-    }}
-
-    await browser.close();
-}}
-
-capture();
-"""
-
-    # Write temporary script
-    temp_script = PROJECT_ROOT / '_temp_capture.js'
-    with open(temp_script, 'w') as f:
-        f.write(script)
-
-    try:
-        result = subprocess.run(
-            ['node', str(temp_script)],
-            capture_output=True,
-            text=True,
-            cwd=str(PROJECT_ROOT),
-            timeout=60
-        )
-        success = 'SUCCESS' in result.stdout
-        if not success:
-            print(f"  Screenshot error: {result.stdout.strip()} {result.stderr.strip()}")
-        return success
-    except subprocess.TimeoutExpired:
-        print(f"  Screenshot timeout")
-        return False
-    finally:
-        temp_script.unlink(missing_ok=True)
-
-
 def get_current_max_id(index_html_content):
     """Extract the current maximum ID from index.html."""
     # Find all id values in the cooperatives array
-    id_matches = re.findall(r'\{\s*id:\s*(\d+)', index_html_content)
+    id_matches = ID_PATTERN.findall(index_html_content)
     if id_matches:
         return max(int(id) for id in id_matches)
     return 0
@@ -134,48 +64,34 @@ def get_current_max_id(index_html_content):
 
 def generate_coop_entry(coop):
     """Generate JavaScript object entry for a cooperative."""
-    # Escape quotes in name
-    name = coop['name'].replace("'", "\\'")
-    category = coop['category']
-    website = coop['website']
-
-    return f"        {{ id: {coop['id']}, name: '{name}', category: '{category}', website: '{website}' }}"
-
-
-def update_index_html(index_html_path, cooperatives):
-    """Add new cooperatives to index.html."""
-    with open(index_html_path, 'r') as f:
-        content = f.read()
-
-    # Find the cooperatives array - look for the closing bracket
-    # The array is defined like: const cooperatives = [ ... ];
-    pattern = r'(const cooperatives = \[)(.*?)(\];)'
-    match = re.search(pattern, content, re.DOTALL)
-
-    if not match:
+    # json.dumps yields valid JS string literals, escaping quotes,
+    # backslashes and newlines alike
+    name = json.dumps(coop['name'])
+    category = json.dumps(coop['category'])
+    website = json.dumps(coop['website'])
+
+    return f"        {{ id: {coop['id']}, name: {name}, category: {category}, website: {website} }}"
+
+
+def update_index_html(content, cooperatives):
+    """Return index.html content with new cooperatives added to the array."""
+    # Find the cooperatives array with plain string searches. Entries never
+    # contain "];", so the first one after the opening marker closes the array.
+    array_start = content.find('const cooperatives = [')
+    array_end = content.find('];', array_start) if array_start != -1 else -1
+    if array_end == -1:
         raise ValueError("Could not find cooperatives array in index.html")
 
-    array_start = match.group(1)
-    array_content = match.group(2)
-    array_end = match.group(3)
+    # Insert after the last existing entry, dropping trailing whitespace/commas
+    insert_at = array_end
+    while content[insert_at - 1] in ' \t\r\n,':
+        insert_at -= 1
 
     # Generate new entries
     new_entries = [generate_coop_entry(coop) for coop in cooperatives]
     new_entries_str = ',\n'.join(new_entries)
 
-    # Add new entries before the closing bracket
-    # Strip trailing whitespace/commas from existing content
-    array_content = array_content.rstrip().rstrip(',')
-
-    updated_array = f"{array_start}{array_content},\n{new_entries_str}\n      {array_end}"
-
-    # Replace in content
-    new_content = re.sub(pattern, updated_array, content, flags=re.DOTALL)
-
-    with open(index_html_path, 'w') as f:
-        f.write(new_content)
-
-    return len(cooperatives)
+    return f"{content[:insert_at]},\n{new_entries_str}\n      {content[array_end:]}"
 
 
 def main():
@@ -210,9 +126,8 @@ def main():
         print("Aborted.")
         return
 
-    # Read current index.html to get max ID
-    with open(INDEX_HTML_PATH, 'r') as f:
-        index_content = f.read()
+    # Read current index.html once; it is written back once after capture
+    index_content = INDEX_HTML_PATH.read_text()
     current_max_id = get_current_max_id(index_content)
     print(f"\nCurrent max ID in website: {current_max_id}")
 
@@ -226,13 +141,23 @@ def main():
     # Capture screenshots
     print("\nCapturing screenshots...")
     successful = []
-    for coop in exportable:
-        print(f"  Capturing {coop['name']}...")
-        if capture_screenshot(coop, SCREENSHOTS_DIR):
-            successful.append(coop)
-            print(f"    Done")
-        else:
-            print(f"    Failed - skipping")
+    worker = start_screenshot_worker(SCREENSHOTS_DIR)
+    if worker is None:
+        sys.exit(1)
+    try:
+        for coop, error in worker.capture_all(exportable):
+            print(f"  Capturing {coop['name']}...")
+            if error is None:
+                successful.append(coop)
+                print(f"    Done")
+            else:
+                print(f"  Screenshot error: {error}")
+                print(f"    Failed - skipping")
+    finally:
+        worker.close()
+
+    # Captures finish out of order; keep index.html entries sorted by ID
+    successful.sort(key=lambda c: c['id'])
 
     if not successful:
         print("\nNo screenshots captured successfully. Aborting import.")
@@ -240,17 +165,22 @@ def main():
 
     # Update index.html
     print(f"\nUpdating index.html with {len(successful)} cooperatives...")
-    count = update_index_html(INDEX_HTML_PATH, successful)
-    print(f"  Added {count} entries")
-
-    # Mark as exported in labeled_data
-    exported_websites = {c['website'] for c in successful}
-    for coop in labeled_data['verified_cooperatives']:
-        if coop['website'] in exported_websites:
+    INDEX_HTML_PATH.write_text(update_index_html(index_content, successful))
+    print(f"  Added {len(successful)} entries")
+
+    # Mark as exported in labeled_data, looking entries up by canonical URL
+    # Several entries can share a canonical URL; every one is marked
+    by_url = {}
+    for c in labeled_data['verified_cooperatives']:
+        if c.get('website'):
+            by_url.setdefault(normalize_url(c['website']), []).append(c)
+    now = datetime.now().isoformat()
+    for website in {normalize_url(c['website']) for c in successful}:
+        for coop in by_url.get(website, []):
             coop['exported_to_website'] = True
-            coop['export_date'] = datetime.now().isoformat()
+            coop['export_date'] = now
 
-    labeled_data['metadata']['last_updated'] = datetime.now().isoformat()
+    labeled_data['metadata']['last_updated'] = now
     save_json(labeled_data, LABELED_DATA_PATH)
 
     print("\n" + "=" * 60)
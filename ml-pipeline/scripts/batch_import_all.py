@@ -5,24 +5,38 @@ Batch import all verified cooperatives with websites into the website.
 This script:
 1. Reads cooperatives from verified_with_websites.json
 2. Compares against existing cooperatives in index.html
-3. Captures screenshots for new cooperatives using Puppeteer
+3. Captures screenshots for new cooperatives using a single Puppeteer browser
 4. Updates index.html with new cooperative entries
 
 Usage:
-    python batch_import_all.py [--dry-run] [--limit N]
+    python batch_import_all.py [--dry-run] [--limit N] [--concurrency N] [--browser-url U] [--force]
 
 Options:
     --dry-run       Show what would be imported without making changes
     --limit N       Only import N cooperatives (for testing)
+    --concurrency N Pages to capture in parallel (default: 4)
+    --browser-url U Reuse a Chrome already running with --remote-debugging-port
+    --force         Recapture screenshots that already exist on disk
 """
 
+import os
 import json
 import argparse
 import subprocess
 import re
+import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from coop_utils import load_json, normalize_url, save_json
+
+# ijson is optional; without it large files are parsed in one go
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 ML_PIPELINE_DIR = Path(__file__).parent.parent
@@ -31,176 +45,255 @@ VERIFIED_WITH_WEBSITES_PATH = DATA_DIR / "verified_with_websites.json"
 LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 INDEX_HTML_PATH = PROJECT_ROOT / "index.html"
 SCREENSHOTS_DIR = PROJECT_ROOT / "screenshots"
+CAPTURE_WORKER_PATH = Path(__file__).parent / "capture_worker.js"
+# {id: url} of every screenshot this script captured, so a PNG is only
+# reused for the same website it was taken of. Kept with the other derived
+# caches (gitignored) so the published screenshots/ holds only images.
+SCREENSHOT_MANIFEST_PATH = DATA_DIR / ".cache" / "screenshot_manifest.json"
 
+# One cooperative entry in index.html: its id and (optional) website
+INDEX_ENTRY_PATTERN = re.compile(r"\{\s*id:\s*(\d+)(?:[^}]*?website:\s*['\"]([^'\"]+)['\"])?")
 
-def load_json(path):
-    """Load JSON file."""
-    with open(path, 'r') as f:
-        return json.load(f)
+# Stream verified_with_websites.json instead of loading it whole above this size
+STREAM_THRESHOLD_BYTES = 10_000_000
 
+# Screenshots smaller than this are treated as failed captures
+MIN_SCREENSHOT_BYTES = 1024
 
-def save_json(data, path):
-    """Save JSON file with pretty formatting."""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+# Seconds to wait for the worker's next result before killing it; pages time
+# out after 15s, so only a hung worker or browser goes this long
+RESULT_TIMEOUT = 60
 
 
-def get_existing_websites(index_html_path):
-    """Extract existing website URLs from index.html."""
-    with open(index_html_path, 'r') as f:
-        content = f.read()
+def get_existing_screenshots(screenshots_dir):
+    """Return filenames of usable screenshots already on disk (one directory scan)."""
+    if not screenshots_dir.is_dir():
+        return set()
+    with os.scandir(screenshots_dir) as entries:
+        return {
+            entry.name for entry in entries
+            if entry.name.endswith('.png') and entry.stat().st_size > MIN_SCREENSHOT_BYTES
+        }
 
-    # Find all website values
-    websites = set()
-    matches = re.findall(r"website:\s*['\"]([^'\"]+)['\"]", content)
-    for url in matches:
-        # Normalize URL for comparison
-        normalized = url.lower().rstrip('/')
-        websites.add(normalized)
-
-    return websites
-
-
-def get_current_max_id(index_html_path):
-    """Extract the current maximum ID from index.html."""
-    with open(index_html_path, 'r') as f:
-        content = f.read()
-
-    id_matches = re.findall(r'\{\s*id:\s*(\d+)', content)
-    if id_matches:
-        return max(int(id) for id in id_matches)
-    return 0
-
-
-def capture_screenshot(coop, screenshots_dir):
-    """Capture screenshot for a cooperative using Node.js script."""
-    script = f"""
-const puppeteer = require('puppeteer');
-
-async function capture() {{
-    const browser = await puppeteer.launch({{
-        headless: true,
-        channel: 'chrome',
-        args: ['--no-sandbox', '--disable-setuid-sandbox']
-    }});
-
-    const page = await browser.newPage();
-    await page.setViewport({{ width: 1280, height: 800 }});
-    await page.setUserAgent('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36');
-
-    try {{
-        await page.goto('{coop["website"]}', {{
-            waitUntil: 'networkidle2',
-            timeout: 30000
-        }});
-        await new Promise(r => setTimeout(r, 2000));
-
-        const filename = '{coop["id"]}.png';
-        await page.screenshot({{
-            path: '{screenshots_dir}/' + filename,
-            fullPage: false
-        }});
-        console.log('SUCCESS: ' + filename);
-    }} catch (error) {{
-        console.log('ERROR: ' + error.message);
-    }}
-
-    await browser.close();
-}}
-
-capture();
-"""
-
-    temp_script = PROJECT_ROOT / '_temp_capture.js'
-    with open(temp_script, 'w') as f:
-        f.write(script)
 
+def load_screenshot_manifest(path):
+    """Load the {id: url} screenshot manifest (empty if missing or unreadable)."""
     try:
-        result = subprocess.run(
-            ['node', str(temp_script)],
-            capture_output=True,
+        return load_json(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def scan_index_html(content):
+    """Extract the maximum ID and existing website URLs from index.html content.
+
+    Each cooperative entry is visited once; the website (if any) is matched
+    within the same entry as its ID.
+    """
+    max_id = 0
+    websites = set()
+    for match in INDEX_ENTRY_PATTERN.finditer(content):
+        max_id = max(max_id, int(match.group(1)))
+        if match.group(2):
+            websites.add(normalize_url(match.group(2)))
+    return max_id, frozenset(websites)
+
+
+def load_new_cooperatives(path, existing_websites):
+    """Load cooperatives with a website that isn't already in index.html.
+
+    Large files are streamed with ijson so that only the new cooperatives
+    are ever materialized; small ones are faster to parse in one go.
+    """
+    def is_new(coop):
+        website = normalize_url(coop.get('website', ''))
+        return website and website not in existing_websites
+
+    if ijson is not None and path.stat().st_size > STREAM_THRESHOLD_BYTES:
+        with open(path, 'rb') as f:
+            return [c for c in ijson.items(f, 'cooperatives.item', use_float=True) if is_new(c)]
+    return [c for c in load_json(path)['cooperatives'] if is_new(c)]
+
+
+class ScreenshotWorker:
+    """Long-lived Node process that captures screenshots with one shared browser.
+
+    Chrome is launched once per batch instead of once per cooperative (or,
+    with `browser_url`, an already-running Chrome is reused), and up to
+    `concurrency` pages are captured in parallel. Jobs are sent to
+    capture_worker.js as JSON lines on stdin and results are read back one
+    line per job from stdout.
+    """
+
+    def __init__(self, screenshots_dir, concurrency=4, browser_url=None):
+        self.screenshots_dir = Path(screenshots_dir)
+        self.concurrency = concurrency
+        self.browser_url = browser_url
+        self.process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def start(self):
+        """Start the Node worker process."""
+        env = {**os.environ, 'CONCURRENCY': str(self.concurrency)}
+        if self.browser_url:
+            env['BROWSER_URL'] = self.browser_url
+        self.process = subprocess.Popen(
+            ['node', str(CAPTURE_WORKER_PATH)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
             text=True,
+            bufsize=1,
             cwd=str(PROJECT_ROOT),
-            timeout=60
+            env=env
         )
-        success = 'SUCCESS' in result.stdout
-        if not success:
-            error_msg = result.stdout.strip() or result.stderr.strip()
-            print(f"    Error: {error_msg[:80]}")
-        return success
-    except subprocess.TimeoutExpired:
-        print(f"    Timeout")
-        return False
-    except Exception as e:
-        print(f"    Exception: {e}")
-        return False
-    finally:
-        temp_script.unlink(missing_ok=True)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def capture_all(self, coops):
+        """Capture screenshots for cooperatives.
+
+        Yields (coop, error) pairs in completion order; error is None on success.
+        """
+        # Only a few jobs are in flight at a time and results are read as
+        # they arrive. Writing every job up front could deadlock once the
+        # worker's stdout pipe filled with results nobody was reading yet.
+        # Twice the page count keeps every page busy between results.
+        max_in_flight = 2 * self.concurrency
+        queued = iter(coops)
+        pending = {}
+        exhausted = False
+        timed_out = threading.Event()
+
+        def kill_stalled_worker():
+            timed_out.set()
+            self.process.kill()
+
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                coop = next(queued, None)
+                if coop is None:
+                    exhausted = True
+                    break
+                job = {
+                    'id': coop['id'],
+                    'url': coop['website'],
+                    'path': str(self.screenshots_dir / f"{coop['id']:03d}.png")
+                }
+                pending[coop['id']] = coop
+                try:
+                    self.process.stdin.write(json.dumps(job) + '\n')
+                    self.process.stdin.flush()
+                except BrokenPipeError:
+                    # Worker exited; whatever is left is reported below
+                    exhausted = True
+
+            if not pending:
+                break
+            # Kill a worker that stops reporting, so readline() returns and
+            # the jobs still pending are reported as timed out
+            watchdog = threading.Timer(RESULT_TIMEOUT, kill_stalled_worker)
+            watchdog.start()
+            try:
+                line = self.process.stdout.readline()
+            finally:
+                watchdog.cancel()
+            if not line:
+                break
+            status, _, rest = line.rstrip('\n').partition(' ')
+            coop_id, _, message = rest.partition(' ')
+            coop = pending.pop(int(coop_id), None)
+            if coop is not None:
+                yield coop, None if status == 'SUCCESS' else message
+
+        error = "screenshot timed out" if timed_out.is_set() else "screenshot worker exited"
+        for coop in pending.values():
+            yield coop, error
+        for coop in queued:
+            yield coop, error
+
+    def close(self):
+        """Close stdin so the worker shuts down its browser and exits."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+
+def start_screenshot_worker(screenshots_dir, concurrency=4, browser_url=None):
+    """Start a ScreenshotWorker, or print why it couldn't start and return None."""
+    try:
+        return ScreenshotWorker(screenshots_dir, concurrency, browser_url).start()
+    except FileNotFoundError:
+        print("\nError: node not found. Install Node.js (and puppeteer) to capture screenshots.")
+    except OSError as e:
+        print(f"\nError: could not start the screenshot worker: {e}")
+    print("Aborting import; nothing was changed.")
+    return None
 
 
 def generate_coop_entry(coop):
     """Generate JavaScript object entry for a cooperative."""
-    name = coop['name'].replace("'", "\\'").replace('"', '\\"')
-    category = coop['category']
-    website = coop['website']
-    location = coop.get('location', 'Iowa')
-
-    return f"            {{ id: {coop['id']}, name: '{name}', location: '{location}', type: '{category.title()}', website: '{website}', category: '{category}' }}"
-
-
-def update_index_html(index_html_path, cooperatives):
-    """Add new cooperatives to index.html."""
-    with open(index_html_path, 'r') as f:
-        content = f.read()
-
-    # Find the cooperatives array
-    pattern = r'(const cooperatives = \[)(.*?)(\];)'
-    match = re.search(pattern, content, re.DOTALL)
-
-    if not match:
+    # json.dumps yields valid JS string literals, escaping quotes,
+    # backslashes and newlines alike
+    name = json.dumps(coop['name'])
+    location = json.dumps(coop.get('location', 'Iowa'))
+    coop_type = json.dumps(coop['category'].title())
+    website = json.dumps(coop['website'])
+    category = json.dumps(coop['category'])
+
+    return f"            {{ id: {coop['id']}, name: {name}, location: {location}, type: {coop_type}, website: {website}, category: {category} }}"
+
+
+def update_index_html(content, cooperatives):
+    """Return index.html content with new cooperatives added to the array."""
+    # Find the cooperatives array with plain string searches. Entries never
+    # contain "];", so the first one after the opening marker closes the array.
+    array_start = content.find('const cooperatives = [')
+    array_end = content.find('];', array_start) if array_start != -1 else -1
+    if array_end == -1:
         raise ValueError("Could not find cooperatives array in index.html")
 
-    array_start = match.group(1)
-    array_content = match.group(2)
-    array_end = match.group(3)
+    # Insert after the last existing entry, dropping trailing whitespace/commas
+    insert_at = array_end
+    while content[insert_at - 1] in ' \t\r\n,':
+        insert_at -= 1
 
     # Generate new entries
     new_entries = [generate_coop_entry(coop) for coop in cooperatives]
     new_entries_str = ',\n'.join(new_entries)
 
-    # Add new entries before the closing bracket
-    array_content = array_content.rstrip().rstrip(',')
-
-    updated_array = f"{array_start}{array_content},\n{new_entries_str}\n        {array_end}"
-
-    new_content = re.sub(pattern, updated_array, content, flags=re.DOTALL)
-
-    with open(index_html_path, 'w') as f:
-        f.write(new_content)
-
-    return len(cooperatives)
+    return f"{content[:insert_at]},\n{new_entries_str}\n        {content[array_end:]}"
 
 
 def main():
     parser = argparse.ArgumentParser(description='Import all verified cooperatives to website')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be imported')
     parser.add_argument('--limit', type=int, help='Limit number of imports')
+    parser.add_argument('--concurrency', type=int, default=4, help='Pages to capture in parallel')
+    parser.add_argument('--browser-url', help='Reuse a running Chrome, e.g. http://127.0.0.1:9222')
+    parser.add_argument('--force', action='store_true', help='Recapture existing screenshots')
     args = parser.parse_args()
 
-    print("Loading data...")
-    verified_data = load_json(VERIFIED_WITH_WEBSITES_PATH)
-    all_coops = verified_data['cooperatives']
-
-    # Get existing websites from index.html
-    existing_websites = get_existing_websites(INDEX_HTML_PATH)
+    # Get existing websites from index.html (read once, written once at the end)
+    index_content = INDEX_HTML_PATH.read_text()
+    current_max_id, existing_websites = scan_index_html(index_content)
     print(f"Existing cooperatives on website: {len(existing_websites)}")
 
     # Filter to only new cooperatives
-    new_coops = []
-    for coop in all_coops:
-        website = coop.get('website', '').lower().rstrip('/')
-        if website and website not in existing_websites:
-            new_coops.append(coop)
+    print("Loading data...")
+    new_coops = load_new_cooperatives(VERIFIED_WITH_WEBSITES_PATH, existing_websites)
 
     print(f"New cooperatives to import: {len(new_coops)}")
 
@@ -230,8 +323,6 @@ def main():
         print("Aborted.")
         return
 
-    # Get current max ID
-    current_max_id = get_current_max_id(INDEX_HTML_PATH)
     print(f"\nCurrent max ID: {current_max_id}")
 
     # Assign new IDs
@@ -243,14 +334,58 @@ def main():
     successful = []
     failed = []
 
-    for i, coop in enumerate(new_coops):
-        print(f"  [{i+1}/{len(new_coops)}] {coop['name'][:40]}...", end=" ", flush=True)
-        if capture_screenshot(coop, SCREENSHOTS_DIR):
-            successful.append(coop)
-            print("OK")
-        else:
-            failed.append(coop)
-            print("FAILED")
+    # Reuse screenshots left behind by an earlier, interrupted run. IDs are
+    # reassigned on every run, so a PNG only counts if the manifest says it
+    # was captured from this coop's website (and the capture completed).
+    manifest = load_screenshot_manifest(SCREENSHOT_MANIFEST_PATH)
+    to_capture = new_coops
+    if not args.force:
+        existing_screenshots = get_existing_screenshots(SCREENSHOTS_DIR)
+        to_capture = []
+        stale = 0
+        for coop in new_coops:
+            if f"{coop['id']:03d}.png" not in existing_screenshots:
+                to_capture.append(coop)
+            elif manifest.get(str(coop['id'])) == coop['website']:
+                successful.append(coop)
+            else:
+                stale += 1
+                to_capture.append(coop)
+        if successful:
+            print(f"  Reusing {len(successful)} existing screenshots (use --force to recapture)")
+        if stale:
+            print(f"  Recapturing {stale} screenshots taken of a different website")
+
+    shutdown = None
+    if to_capture:
+        worker = start_screenshot_worker(SCREENSHOTS_DIR, args.concurrency, args.browser_url)
+        if worker is None:
+            sys.exit(1)
+        try:
+            for i, (coop, error) in enumerate(worker.capture_all(to_capture)):
+                if error is None:
+                    successful.append(coop)
+                    manifest[str(coop['id'])] = coop['website']
+                    status = "OK"
+                else:
+                    failed.append(coop)
+                    manifest.pop(str(coop['id']), None)
+                    status = "FAILED"
+                print(f"  [{i+1}/{len(to_capture)}] {coop['name'][:40]}... {status}")
+                if error:
+                    print(f"    Error: {error[:80]}")
+        finally:
+            # Saved even after an interrupted run, so its captures are reused
+            SCREENSHOT_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+            save_json(manifest, SCREENSHOT_MANIFEST_PATH)
+
+            # Closing Chrome takes a while; let it happen in the background
+            # while index.html and labeled_data.json are written
+            shutdown = threading.Thread(target=worker.close)
+            shutdown.start()
+
+    # Captures finish out of order; keep index.html entries sorted by ID
+    successful.sort(key=lambda c: c['id'])
 
     if not successful:
         print("\nNo screenshots captured successfully. Aborting import.")
@@ -258,22 +393,28 @@ def main():
 
     # Update index.html
     print(f"\nUpdating index.html with {len(successful)} cooperatives...")
-    count = update_index_html(INDEX_HTML_PATH, successful)
-    print(f"  Added {count} entries")
+    INDEX_HTML_PATH.write_text(update_index_html(index_content, successful))
+    print(f"  Added {len(successful)} entries")
 
     # Update labeled_data.json to mark as exported
     labeled_data = load_json(LABELED_DATA_PATH)
-    exported_websites = {c['website'].lower().rstrip('/') for c in successful}
-
-    for coop in labeled_data['verified_cooperatives']:
-        website = coop.get('website', '').lower().rstrip('/')
-        if website in exported_websites:
+    # Several entries can share a canonical URL; every one is marked
+    by_url = {}
+    for c in labeled_data['verified_cooperatives']:
+        if c.get('website'):
+            by_url.setdefault(normalize_url(c['website']), []).append(c)
+    now = datetime.now().isoformat()
+    for website in {normalize_url(c['website']) for c in successful}:
+        for coop in by_url.get(website, []):
             coop['exported_to_website'] = True
-            coop['export_date'] = datetime.now().isoformat()
+            coop['export_date'] = now
 
-    labeled_data['metadata']['last_updated'] = datetime.now().isoformat()
+    labeled_data['metadata']['last_updated'] = now
     save_json(labeled_data, LABELED_DATA_PATH)
 
+    if shutdown:
+        shutdown.join()
+
     print("\n" + "=" * 60)
     print("IMPORT COMPLETE")
     print("=" * 60)
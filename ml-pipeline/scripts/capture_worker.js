@@ -0,0 +1,159 @@
+/**
+ * Persistent screenshot worker used by batch_import_all.py.
+ *
+ * Launches a single headless Chrome and keeps it open for the whole batch,
+ * capturing up to CONCURRENCY pages at a time (default 4). Each page is
+ * reused for successive jobs.
+ * Jobs arrive on stdin as one JSON object per line:
+ *
+ *     {"id": 210, "url": "https://example.coop/", "path": "/abs/path/210.png"}
+ *
+ * and one result line per job is written to stdout, in completion order:
+ *
+ *     SUCCESS 210
+ *     ERROR 210 <message>
+ *
+ * The worker exits (closing the browser) when stdin is closed.
+ *
+ * If BROWSER_URL is set (e.g. http://127.0.0.1:9222), the worker attaches to
+ * an already-running Chrome started with --remote-debugging-port instead of
+ * launching its own, and disconnects from it on exit.
+ */
+
+const fs = require('fs');
+const puppeteer = require('puppeteer');
+const readline = require('readline');
+
+const USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36';
+const VIEWPORT = { width: 1280, height: 800 };
+const CONCURRENCY = Math.max(1, parseInt(process.env.CONCURRENCY || '4', 10) || 1);
+
+// Requests that don't change an above-the-fold thumbnail
+const BLOCKED_RESOURCE_TYPES = new Set(['media', 'font', 'websocket', 'manifest', 'other']);
+const BLOCKED_URL_PATTERN = /doubleclick|googletagmanager|google-analytics|googlesyndication|facebook\.net|hotjar/;
+
+// Each concurrency slot keeps one page (and its CDP session) for the whole
+// batch, so viewport, user agent and interception are set up once per slot
+// rather than once per cooperative.
+async function openSlot(browser) {
+    const page = await browser.newPage();
+    await page.setViewport(VIEWPORT);
+    await page.setUserAgent(USER_AGENT);
+    page.setDefaultNavigationTimeout(15000);
+
+    await page.setRequestInterception(true);
+    page.on('request', request => {
+        if (BLOCKED_RESOURCE_TYPES.has(request.resourceType()) || BLOCKED_URL_PATTERN.test(request.url())) {
+            request.abort();
+        } else {
+            request.continue();
+        }
+    });
+
+    const client = await page.createCDPSession();
+    return { page, client };
+}
+
+async function capture(slot, job) {
+    const { page, client } = slot;
+    try {
+        // domcontentloaded is enough for a thumbnail; networkidle can hang
+        // for the full timeout on sites with analytics beacons
+        await page.goto(job.url, { waitUntil: 'domcontentloaded' });
+        await page.waitForFunction('document.readyState !== "loading"', { timeout: 5000 }).catch(() => {});
+
+        // The viewport is fixed, so page.screenshot()'s layout-metrics and
+        // device-override round trips are redundant; ask CDP directly.
+        const { data } = await client.send('Page.captureScreenshot', {
+            format: 'png',
+            clip: { x: 0, y: 0, ...VIEWPORT, scale: 1 },
+            captureBeyondViewport: false
+        });
+        return Buffer.from(data, 'base64');
+    } finally {
+        // Cancel anything still loading before the slot's next navigation
+        await page.evaluate(() => window.stop()).catch(() => {});
+    }
+}
+
+function report(job, error) {
+    if (error) {
+        console.log(`ERROR ${job.id} ${error.message.split('\n')[0]}`);
+    } else {
+        console.log(`SUCCESS ${job.id}`);
+    }
+}
+
+// PNGs are flushed to disk in the background so a capture slot can start
+// its next navigation without waiting on the filesystem.
+const pendingWrites = new Set();
+
+function save(job, png) {
+    const task = fs.promises.writeFile(job.path, png)
+        .then(() => report(job), error => report(job, error))
+        .finally(() => pendingWrites.delete(task));
+    pendingWrites.add(task);
+}
+
+async function run(slot, job) {
+    try {
+        save(job, await capture(slot, job));
+        return true;
+    } catch (error) {
+        report(job, error);
+        return false;
+    }
+}
+
+async function openBrowser() {
+    if (process.env.BROWSER_URL) {
+        return puppeteer.connect({ browserURL: process.env.BROWSER_URL });
+    }
+    return puppeteer.launch({
+        headless: true,
+        channel: 'chrome',
+        args: ['--no-sandbox', '--disable-setuid-sandbox']
+    });
+}
+
+async function main() {
+    const browser = await openBrowser();
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+    const running = new Set();
+    const idle = [];
+
+    for await (const line of rl) {
+        if (!line.trim()) {
+            continue;
+        }
+        if (running.size >= CONCURRENCY) {
+            await Promise.race(running);
+        }
+        const job = JSON.parse(line);
+        const task = (async () => {
+            const slot = idle.pop() || await openSlot(browser);
+            if (await run(slot, job)) {
+                idle.push(slot);
+            } else {
+                // A failed navigation can leave the page wedged; start fresh
+                await slot.page.close().catch(() => {});
+            }
+        })().catch(error => report(job, error)).finally(() => running.delete(task));
+        running.add(task);
+    }
+
+    await Promise.all(running);
+    await Promise.all(pendingWrites);
+    await Promise.all(idle.map(slot => slot.page.close()));
+    if (process.env.BROWSER_URL) {
+        await browser.disconnect();
+    } else {
+        await browser.close();
+    }
+}
+
+main().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
@@ -0,0 +1,140 @@
+"""
+Shared helpers for the ML pipeline scripts.
+"""
+
+import os
+import re
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+# orjson is several times faster than the stdlib for both parsing and
+# indented output; fall back to json when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Corporate suffixes (", inc", " llc", ...) and periods stripped from names
+NAME_SUFFIX_PATTERN = re.compile(r'(?:,\s*|\s+)(?:inc|llc|ltd)\b|\.')
+
+# Domain of an http(s) URL, without the www prefix
+DOMAIN_PATTERN = re.compile(r'^https?://(?:www\.)?([^/?#]+)', re.IGNORECASE)
+
+
+def load_json(path):
+    """Load JSON file."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def save_json(data, path):
+    """Save JSON file with pretty formatting.
+
+    The data is written to a temporary file that then replaces path, so an
+    interrupted save never leaves a truncated file behind.
+    """
+    write_bytes_atomic(path, dumps_indented(data))
+
+
+def write_bytes_atomic(path, data: bytes):
+    """Write bytes to a temporary file, then move it over path."""
+    path = Path(path)
+    # Unique per process and thread, so concurrent saves don't collide
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def dumps_indented(item):
+    """Serialize one value with 2-space indentation, as UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(item, option=orjson.OPT_INDENT_2)
+    return json.dumps(item, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def dumps_line(item):
+    """Serialize one value as a compact JSON Lines record (UTF-8 bytes)."""
+    if orjson is not None:
+        return orjson.dumps(item) + b'\n'
+    return json.dumps(item, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def load_jsonl(path):
+    """Load a JSON Lines file as a list.
+
+    A final line without a newline (a write cut off mid-record) is ignored.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    records = []
+    for line in Path(path).read_bytes().splitlines(keepends=True):
+        if not line.endswith(b'\n'):
+            break
+        if line.strip():
+            records.append(loads(line))
+    return records
+
+
+def write_json_array(items, path, fsync=False):
+    """Write an iterable as a JSON array, one element at a time.
+
+    Output matches save_json(list(items), path), but only one serialized
+    element is held in memory at once, and a 1 MiB buffer keeps the number
+    of write calls low. With fsync=True the file is flushed to disk before
+    returning.
+    """
+    with open(path, 'wb', buffering=1 << 20) as f:
+        first = True
+        for item in items:
+            f.write(b'[\n' if first else b',\n')
+            # Nest the element one level; strings never contain raw newlines
+            f.write(b'\n'.join(b'  ' + line for line in dumps_indented(item).split(b'\n')))
+            first = False
+        f.write(b'[]' if first else b'\n]')
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def normalize_url(url):
+    """Normalize website URL for comparison (lowercase, no trailing slash)."""
+    # rstrip() returns the string itself when there is no trailing slash, so
+    # stripping first leaves lower() as the only copy in the common case.
+    return url.rstrip('/').lower()
+
+
+@lru_cache(maxsize=8192)
+def normalize_name(name: str) -> str:
+    """Normalize business name for comparison."""
+    # Remove common suffixes and periods, then extra whitespace
+    return " ".join(NAME_SUFFIX_PATTERN.sub("", name.lower()).split())
+
+
+def index_by_name(items: list) -> dict:
+    """Map each item's name to the item (first occurrence wins)."""
+    return {item['name']: item for item in reversed(items)}
+
+
+def get_verified_names(labeled_data: dict, normalize=None) -> set:
+    """Get set of normalized names from verified cooperatives.
+
+    Names are lowercased and stripped unless a normalize function is given.
+    """
+    coops = labeled_data['verified_cooperatives']
+    if normalize is None:
+        return {coop['name'].lower().strip() for coop in coops}
+    return {normalize(coop['name']) for coop in coops}
+
+
+@lru_cache(maxsize=8192)
+def extract_domain(url: str) -> str | None:
+    """Extract domain from URL."""
+    match = DOMAIN_PATTERN.match(url) if url else None
+    return match.group(1).lower() if match else None
@@ -8,48 +8,67 @@ Sources:
 3. Web search for additional Iowa cooperatives
 
 This script generates a comprehensive candidates.json file.
+
+Usage:
+    python fetch_candidates.py [--check-websites] [--verbose]
+
+Options:
+    --check-websites  Request every candidate website (concurrently) and move
+                      unreachable ones to candidates_need_websites.json
+    --verbose         List each skipped candidate, not just counts per reason
 """
 
-import json
-import csv
-import re
+import pickle
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from operator import itemgetter
 from pathlib import Path
-from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+
+from coop_utils import (
+    DOMAIN_PATTERN, NAME_SUFFIX_PATTERN, extract_domain, load_json, normalize_name,
+    write_bytes_atomic, write_json_array
+)
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 CANDIDATES_FILE = DATA_DIR / "candidates.json"
 NCUA_FILE = DATA_DIR / "FOICU.txt"
+VERIFIED_IDS_CACHE = DATA_DIR / ".verified_ids.cache"
+
+# Website check settings: requests are network-bound, so many run at once
+CHECK_WORKERS = 32
+CHECK_TIMEOUT = 10
+HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
+
+# FOICU.txt columns used to build credit union candidates
+NCUA_COLUMNS = ['CU_NUMBER', 'CU_NAME', 'CITY', 'STATE', 'CharterState']
+
+# Near-duplicate names are compared on all their words except filler, with
+# abbreviations expanded ("CU" -> "credit union"), so type words like
+# "credit union" vs "cooperative" keep different organisations apart. Only
+# names sharing a distinctive (non-type) word are compared, and they must be
+# at least NEAR_DUPLICATE_THRESHOLD similar (0-1)
+NAME_FILLER_TOKENS = frozenset({'a', 'and', 'of', 'the', 'iowa'})
+NAME_TOKEN_ALIASES = {
+    'cu': ('credit', 'union'), 'co': ('company',), 'coop': ('cooperative',),
+    'co-op': ('cooperative',), 'assn': ('association',),
+}
+NAME_TYPE_TOKENS = frozenset({
+    'cooperative', 'cooperatives', 'company', 'association', 'credit', 'union',
+    'community', 'farmers', 'electric', 'rural', 'mutual', 'telephone', 'federal',
+})
+NEAR_DUPLICATE_THRESHOLD = 0.9
 
 
 def load_labeled_data():
     """Load labeled data to check for existing cooperatives."""
-    with open(LABELED_DATA_PATH) as f:
-        return json.load(f)
-
-
-def normalize_name(name: str) -> str:
-    """Normalize business name for comparison."""
-    name = name.lower().strip()
-    # Remove common suffixes
-    for suffix in [", inc", " inc", ", llc", " llc", ", ltd", " ltd", "."]:
-        name = name.replace(suffix, "")
-    # Remove extra whitespace
-    name = " ".join(name.split())
-    return name
-
-
-def extract_domain(url: str) -> str | None:
-    """Extract domain from URL."""
-    try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        if domain.startswith("www."):
-            domain = domain[4:]
-        return domain
-    except:
-        return None
+    return load_json(LABELED_DATA_PATH)
 
 
 def get_verified_identifiers(labeled_data):
@@ -61,7 +80,37 @@ def get_verified_identifiers(labeled_data):
             domain = extract_domain(coop['website'])
             if domain:
                 identifiers.add(domain)
-    return identifiers
+    return frozenset(identifiers)
+
+
+def load_verified_identifiers():
+    """Get verified names/domains and the verified count, cached on disk.
+
+    The cache is keyed on labeled_data.json's mtime and size (and the
+    normalization patterns), so it is rebuilt whenever the file changes.
+    Returns (identifiers, verified_count).
+    """
+    stat = LABELED_DATA_PATH.stat()
+    key = (stat.st_mtime_ns, stat.st_size, NAME_SUFFIX_PATTERN.pattern, DOMAIN_PATTERN.pattern)
+    try:
+        with open(VERIFIED_IDS_CACHE, 'rb') as f:
+            cached_key, identifiers, count = pickle.load(f)
+        if cached_key == key:
+            return identifiers, count
+    except Exception:
+        # A missing, truncated or corrupt cache is just a miss (unpickling
+        # can raise almost anything on bad data)
+        pass
+
+    labeled_data = load_labeled_data()
+    identifiers = get_verified_identifiers(labeled_data)
+    count = len(labeled_data['verified_cooperatives'])
+    # The cache is only a speedup; failing to write it must not stop the fetch
+    try:
+        write_bytes_atomic(VERIFIED_IDS_CACHE, pickle.dumps((key, identifiers, count)))
+    except OSError as e:
+        print(f"  Error caching verified identifiers: {e}")
+    return identifiers, count
 
 
 def fetch_ncua_credit_unions():
@@ -72,181 +121,281 @@ def fetch_ncua_credit_unions():
         print("  NCUA file not found. Run: curl -L -o ncua_data.zip 'https://ncua.gov/files/publications/analysis/call-report-data-2024-12.zip' && unzip ncua_data.zip")
         return candidates
 
-    with open(NCUA_FILE, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Filter for Iowa (CharterState or STATE = IA)
-            if row.get('STATE') == 'IA' or row.get('CharterState') == 'IA':
-                name = row.get('CU_NAME', '').strip()
-                city = row.get('CITY', '').strip()
-
-                # Skip if name is empty
-                if not name:
-                    continue
-
-                # Clean up name - add "Credit Union" if not present
-                if 'credit union' not in name.lower() and 'cu' not in name.lower():
-                    display_name = f"{name} Credit Union"
-                else:
-                    display_name = name
-
-                candidates.append({
-                    'name': display_name,
-                    'website': None,  # NCUA data doesn't include websites
-                    'location': f"{city}, IA" if city else "Iowa",
-                    'source': 'ncua',
-                    'ncua_number': row.get('CU_NUMBER'),
-                    'needs_website': True
-                })
+    # Parse only the needed columns as strings and filter Iowa rows with a
+    # vectorized mask; dicts are built for the Iowa subset only
+    df = pd.read_csv(
+        NCUA_FILE,
+        usecols=lambda column: column in NCUA_COLUMNS,
+        dtype=str,
+        keep_default_na=False,
+        encoding='utf-8'
+    ).reindex(columns=NCUA_COLUMNS, fill_value='')
+    df = df[(df['STATE'] == 'IA') | (df['CharterState'] == 'IA')]
+
+    for name, city, cu_number in zip(df['CU_NAME'].str.strip(), df['CITY'].str.strip(), df['CU_NUMBER']):
+        # Skip if name is empty
+        if not name:
+            continue
+
+        # Clean up name - add "Credit Union" if not present
+        if 'credit union' not in name.lower() and 'cu' not in name.lower():
+            display_name = f"{name} Credit Union"
+        else:
+            display_name = name
+
+        candidates.append({
+            'name': display_name,
+            'website': None,  # NCUA data doesn't include websites
+            'location': f"{city}, IA" if city else "Iowa",
+            'source': 'ncua',
+            'ncua_number': cu_number or None,
+            'needs_website': True
+        })
 
     return candidates
 
 
+# Iowa Association of Electric Cooperatives members, built once at import.
+# Source: https://www.iowarec.org/iowa-co-ops/our-members
+IAEC_MEMBERS = (
+    {"name": "Access Energy Cooperative", "website": "https://www.accessenergycoop.com/", "location": "Mt. Pleasant, IA"},
+    {"name": "Allamakee-Clayton Electric Cooperative", "website": "https://www.acrec.com/", "location": "Postville, IA"},
+    {"name": "Boone Valley Electric Cooperative", "website": "https://www.cbpower.coop/", "location": "Renwick, IA"},
+    {"name": "Butler County Rural Electric Cooperative", "website": "https://www.butlerrec.coop/", "location": "Allison, IA"},
+    {"name": "Calhoun County Electric Cooperative Association", "website": "https://www.calhounrec.coop/", "location": "Rockwell City, IA"},
+    {"name": "Chariton Valley Electric Cooperative", "website": "https://www.cvrec.com/", "location": "Albia, IA"},
+    {"name": "Clarke Electric Cooperative", "website": "https://www.cecnet.net/", "location": "Osceola, IA"},
+    {"name": "Consumers Energy Cooperative", "website": "https://www.consumersenergy.coop/", "location": "Marshalltown, IA"},
+    {"name": "Corridor Energy Cooperative", "website": "https://www.corridorenergy.coop/", "location": "Boone, IA"},
+    {"name": "East-Central Iowa Rural Electric Cooperative", "website": "https://www.ecirec.coop/", "location": "Urbana, IA"},
+    {"name": "Eastern Iowa Light & Power Cooperative", "website": "https://www.easterniowa.com/", "location": "Wilton, IA"},
+    {"name": "Farmers Electric Cooperative (Greenfield)", "website": "https://www.farmersrec.com/", "location": "Greenfield, IA"},
+    {"name": "Franklin Rural Electric Cooperative", "website": "https://www.franklinrec.coop/", "location": "Hampton, IA"},
+    {"name": "Grundy County Rural Electric Cooperative", "website": "https://www.grundycountyrecia.com/", "location": "Grundy Center, IA"},
+    {"name": "Guthrie County Rural Electric Cooperative", "website": "https://www.guthrie-rec.coop/", "location": "Guthrie Center, IA"},
+    {"name": "Harrison County Rural Electric Cooperative", "website": "https://www.hcrec.coop/", "location": "Woodbine, IA"},
+    {"name": "Heartland Power Cooperative", "website": "https://www.heartlandpower.com/", "location": "Thompson, IA"},
+    {"name": "Iowa Lakes Electric Cooperative", "website": "https://www.ilec.coop/", "location": "Estherville, IA"},
+    {"name": "L&O Power Cooperative", "website": "https://www.landopowercoop.com/", "location": "Rock Rapids, IA"},
+    {"name": "Lyon Rural Electric Cooperative", "website": "https://www.lyonrec.coop/", "location": "Rock Rapids, IA"},
+    {"name": "Maquoketa Valley Electric Cooperative", "website": "https://www.mvec.coop/", "location": "Anamosa, IA"},
+    {"name": "Midland Power Cooperative", "website": "https://www.midlandpower.coop/", "location": "Jefferson, IA"},
+    {"name": "MiEnergy Cooperative", "website": "https://www.mienergy.coop/", "location": "Cresco, IA"},
+    {"name": "Nishnabotna Valley Rural Electric Cooperative", "website": "https://www.nvrec.com/", "location": "Harlan, IA"},
+    {"name": "North West Rural Electric Cooperative", "website": "https://www.nwrec.com/", "location": "Orange City, IA"},
+    {"name": "Northwest Iowa Power Cooperative (NIPCO)", "website": "https://www.nipco.coop/", "location": "Le Mars, IA"},
+    {"name": "Osceola Electric Cooperative", "website": "https://www.osceolaelectric.com/", "location": "Sibley, IA"},
+    {"name": "Pella Cooperative Electric Association", "website": "https://www.pella-cea.org/", "location": "Pella, IA"},
+    {"name": "Prairie Energy Cooperative", "website": "https://www.prairieenergy.coop/", "location": "Clarion, IA"},
+    {"name": "Raccoon Valley Electric Cooperative", "website": "https://www.rvec.coop/", "location": "Glidden, IA"},
+    {"name": "Southern Iowa Electric Cooperative", "website": "https://www.sie.coop/", "location": "Bloomfield, IA"},
+    {"name": "Southwest Iowa Rural Electric Cooperative", "website": "https://www.swiarec.coop/", "location": "Corning, IA"},
+    {"name": "T.I.P. Rural Electric Cooperative", "website": "https://www.tiprec.com/", "location": "Brooklyn, IA"},
+    {"name": "Western Iowa Power Cooperative (WIPCO)", "website": "https://www.wipco.com/", "location": "Denison, IA"},
+    {"name": "Woodbury County Rural Electric Cooperative", "website": "https://www.woodburyrec.com/", "location": "Moville, IA"},
+    # Generation & Transmission Cooperatives
+    {"name": "Central Iowa Power Cooperative (CIPCO)", "website": "https://www.cipco.net/", "location": "Cedar Rapids, IA"},
+    {"name": "Corn Belt Power Cooperative", "website": "https://www.cbpower.coop/", "location": "Humboldt, IA"},
+)
+IAEC_CANDIDATES = tuple({**coop, 'source': 'iaec'} for coop in IAEC_MEMBERS)
+
+
 def get_iaec_electric_coops():
     """
     Iowa Association of Electric Cooperatives members.
     Source: https://www.iowarec.org/iowa-co-ops/our-members
     """
-    # Data extracted from IAEC website
-    coops = [
-        {"name": "Access Energy Cooperative", "website": "https://www.accessenergycoop.com/", "location": "Mt. Pleasant, IA"},
-        {"name": "Allamakee-Clayton Electric Cooperative", "website": "https://www.acrec.com/", "location": "Postville, IA"},
-        {"name": "Boone Valley Electric Cooperative", "website": "https://www.cbpower.coop/", "location": "Renwick, IA"},
-        {"name": "Butler County Rural Electric Cooperative", "website": "https://www.butlerrec.coop/", "location": "Allison, IA"},
-        {"name": "Calhoun County Electric Cooperative Association", "website": "https://www.calhounrec.coop/", "location": "Rockwell City, IA"},
-        {"name": "Chariton Valley Electric Cooperative", "website": "https://www.cvrec.com/", "location": "Albia, IA"},
-        {"name": "Clarke Electric Cooperative", "website": "https://www.cecnet.net/", "location": "Osceola, IA"},
-        {"name": "Consumers Energy Cooperative", "website": "https://www.consumersenergy.coop/", "location": "Marshalltown, IA"},
-        {"name": "Corridor Energy Cooperative", "website": "https://www.corridorenergy.coop/", "location": "Boone, IA"},
-        {"name": "East-Central Iowa Rural Electric Cooperative", "website": "https://www.ecirec.coop/", "location": "Urbana, IA"},
-        {"name": "Eastern Iowa Light & Power Cooperative", "website": "https://www.easterniowa.com/", "location": "Wilton, IA"},
-        {"name": "Farmers Electric Cooperative (Greenfield)", "website": "https://www.farmersrec.com/", "location": "Greenfield, IA"},
-        {"name": "Franklin Rural Electric Cooperative", "website": "https://www.franklinrec.coop/", "location": "Hampton, IA"},
-        {"name": "Grundy County Rural Electric Cooperative", "website": "https://www.grundycountyrecia.com/", "location": "Grundy Center, IA"},
-        {"name": "Guthrie County Rural Electric Cooperative", "website": "https://www.guthrie-rec.coop/", "location": "Guthrie Center, IA"},
-        {"name": "Harrison County Rural Electric Cooperative", "website": "https://www.hcrec.coop/", "location": "Woodbine, IA"},
-        {"name": "Heartland Power Cooperative", "website": "https://www.heartlandpower.com/", "location": "Thompson, IA"},
-        {"name": "Iowa Lakes Electric Cooperative", "website": "https://www.ilec.coop/", "location": "Estherville, IA"},
-        {"name": "L&O Power Cooperative", "website": "https://www.landopowercoop.com/", "location": "Rock Rapids, IA"},
-        {"name": "Lyon Rural Electric Cooperative", "website": "https://www.lyonrec.coop/", "location": "Rock Rapids, IA"},
-        {"name": "Maquoketa Valley Electric Cooperative", "website": "https://www.mvec.coop/", "location": "Anamosa, IA"},
-        {"name": "Midland Power Cooperative", "website": "https://www.midlandpower.coop/", "location": "Jefferson, IA"},
-        {"name": "MiEnergy Cooperative", "website": "https://www.mienergy.coop/", "location": "Cresco, IA"},
-        {"name": "Nishnabotna Valley Rural Electric Cooperative", "website": "https://www.nvrec.com/", "location": "Harlan, IA"},
-        {"name": "North West Rural Electric Cooperative", "website": "https://www.nwrec.com/", "location": "Orange City, IA"},
-        {"name": "Northwest Iowa Power Cooperative (NIPCO)", "website": "https://www.nipco.coop/", "location": "Le Mars, IA"},
-        {"name": "Osceola Electric Cooperative", "website": "https://www.osceolaelectric.com/", "location": "Sibley, IA"},
-        {"name": "Pella Cooperative Electric Association", "website": "https://www.pella-cea.org/", "location": "Pella, IA"},
-        {"name": "Prairie Energy Cooperative", "website": "https://www.prairieenergy.coop/", "location": "Clarion, IA"},
-        {"name": "Raccoon Valley Electric Cooperative", "website": "https://www.rvec.coop/", "location": "Glidden, IA"},
-        {"name": "Southern Iowa Electric Cooperative", "website": "https://www.sie.coop/", "location": "Bloomfield, IA"},
-        {"name": "Southwest Iowa Rural Electric Cooperative", "website": "https://www.swiarec.coop/", "location": "Corning, IA"},
-        {"name": "T.I.P. Rural Electric Cooperative", "website": "https://www.tiprec.com/", "location": "Brooklyn, IA"},
-        {"name": "Western Iowa Power Cooperative (WIPCO)", "website": "https://www.wipco.com/", "location": "Denison, IA"},
-        {"name": "Woodbury County Rural Electric Cooperative", "website": "https://www.woodburyrec.com/", "location": "Moville, IA"},
-        # Generation & Transmission Cooperatives
-        {"name": "Central Iowa Power Cooperative (CIPCO)", "website": "https://www.cipco.net/", "location": "Cedar Rapids, IA"},
-        {"name": "Corn Belt Power Cooperative", "website": "https://www.cbpower.coop/", "location": "Humboldt, IA"},
-    ]
-
-    candidates = []
-    for coop in coops:
-        candidates.append({
-            'name': coop['name'],
-            'website': coop['website'],
-            'location': coop['location'],
-            'source': 'iaec'
-        })
-
-    return candidates
+    return IAEC_CANDIDATES
+
+
+# Additional known Iowa cooperatives from various sources
+ADDITIONAL_COOPERATIVES = (
+    # Agricultural Cooperatives
+    {"name": "Ag Partners Cooperative", "website": "https://www.agpartnerscoop.com/", "location": "Iowa", "source": "web_search"},
+    {"name": "Hawkeye Cooperative", "website": "https://www.hawkeyecooperative.com/", "location": "Iowa", "source": "web_search"},
+    {"name": "Farmers Cooperative Association Stratford", "website": "https://www.stratfordcoop.com/", "location": "Stratford, IA", "source": "web_search"},
+    {"name": "Frontier Cooperative", "website": "https://www.frontiercoop.com/", "location": "Nebraska/Iowa", "source": "web_search"},
+    {"name": "Landus Cooperative", "website": "https://www.landus.coop/", "location": "Ames, IA", "source": "web_search"},
+    {"name": "Key Cooperative", "website": "https://www.keycooperative.com/", "location": "Roland, IA", "source": "web_search"},
+    {"name": "NEW Cooperative", "website": "https://www.newcoop.com/", "location": "Fort Dodge, IA", "source": "web_search"},
+    {"name": "United Farmers Cooperative", "website": "https://www.ufcgrainco.com/", "location": "Alden, IA", "source": "web_search"},
+    {"name": "Farmers Cooperative Company", "website": "https://www.farmerscooperative.com/", "location": "Farnhamville, IA", "source": "web_search"},
+    {"name": "West Central Cooperative", "website": "https://www.westcentral.coop/", "location": "Ralston, IA", "source": "web_search"},
+    {"name": "North Central Cooperative", "website": "https://www.northcentralcoop.com/", "location": "Manly, IA", "source": "web_search"},
+    {"name": "Innovative Ag Services", "website": "https://www.ikiowa.com/", "location": "Monticello, IA", "source": "web_search"},
+    {"name": "Premier Cooperative", "website": "https://www.premiercooperative.com/", "location": "Reinbeck, IA", "source": "web_search"},
+    {"name": "Stateline Cooperative", "website": "https://www.statelinecoop.com/", "location": "Larchwood, IA", "source": "web_search"},
+
+    # Credit Unions (with known websites)
+    {"name": "Veridian Credit Union", "website": "https://www.veridiancu.org/", "location": "Waterloo, IA", "source": "web_search"},
+    {"name": "Collins Community Credit Union", "website": "https://www.collinscu.org/", "location": "Cedar Rapids, IA", "source": "web_search"},
+    {"name": "DuPont Community Credit Union", "website": "https://www.dupontccu.org/", "location": "Fort Madison, IA", "source": "web_search"},
+    {"name": "Ascentra Credit Union", "website": "https://www.ascentra.org/", "location": "Davenport, IA", "source": "web_search"},
+    {"name": "GreenState Credit Union", "website": "https://www.greenstate.org/", "location": "North Liberty, IA", "source": "web_search"},
+    {"name": "Community Choice Credit Union", "website": "https://www.communitychoicecu.com/", "location": "Johnston, IA", "source": "web_search"},
+
+    # Telecom Cooperatives
+    {"name": "Farmers Mutual Telephone Company", "website": "https://www.fmtc.coop/", "location": "Bellingham, IA", "source": "web_search"},
+    {"name": "Winnebago Cooperative Telecom Association", "website": "https://www.wctatel.net/", "location": "Lake Mills, IA", "source": "web_search"},
+    {"name": "Coon Valley Telecommunications Cooperative", "website": "https://www.coonvalleytelco.com/", "location": "Manning, IA", "source": "web_search"},
+    {"name": "Northeast Iowa Telephone Company", "website": "https://www.neitel.com/", "location": "Monona, IA", "source": "web_search"},
+    {"name": "Mahaska Communication Group", "website": "https://www.mahaska.org/", "location": "Oskaloosa, IA", "source": "web_search"},
+
+    # Food Cooperatives
+    {"name": "New Pioneer Food Co-op", "website": "https://www.newpi.coop/", "location": "Iowa City, IA", "source": "web_search"},
+    {"name": "Wheatsfield Cooperative", "website": "https://www.wheatsfield.coop/", "location": "Ames, IA", "source": "web_search"},
+    {"name": "Oneota Community Food Co-op", "website": "https://www.oneotacoop.com/", "location": "Decorah, IA", "source": "web_search"},
+
+    # Housing Cooperatives
+    {"name": "River Hills Cooperative", "website": "https://www.riverhillscoop.org/", "location": "Des Moines, IA", "source": "web_search"},
+)
 
 
 def search_additional_cooperatives():
     """
     Additional known Iowa cooperatives from various sources.
     """
-    coops = [
-        # Agricultural Cooperatives
-        {"name": "Ag Partners Cooperative", "website": "https://www.agpartnerscoop.com/", "location": "Iowa", "source": "web_search"},
-        {"name": "Hawkeye Cooperative", "website": "https://www.hawkeyecooperative.com/", "location": "Iowa", "source": "web_search"},
-        {"name": "Farmers Cooperative Association Stratford", "website": "https://www.stratfordcoop.com/", "location": "Stratford, IA", "source": "web_search"},
-        {"name": "Frontier Cooperative", "website": "https://www.frontiercoop.com/", "location": "Nebraska/Iowa", "source": "web_search"},
-        {"name": "Landus Cooperative", "website": "https://www.landus.coop/", "location": "Ames, IA", "source": "web_search"},
-        {"name": "Key Cooperative", "website": "https://www.keycooperative.com/", "location": "Roland, IA", "source": "web_search"},
-        {"name": "NEW Cooperative", "website": "https://www.newcoop.com/", "location": "Fort Dodge, IA", "source": "web_search"},
-        {"name": "United Farmers Cooperative", "website": "https://www.ufcgrainco.com/", "location": "Alden, IA", "source": "web_search"},
-        {"name": "Farmers Cooperative Company", "website": "https://www.farmerscooperative.com/", "location": "Farnhamville, IA", "source": "web_search"},
-        {"name": "West Central Cooperative", "website": "https://www.westcentral.coop/", "location": "Ralston, IA", "source": "web_search"},
-        {"name": "North Central Cooperative", "website": "https://www.northcentralcoop.com/", "location": "Manly, IA", "source": "web_search"},
-        {"name": "Innovative Ag Services", "website": "https://www.ikiowa.com/", "location": "Monticello, IA", "source": "web_search"},
-        {"name": "Premier Cooperative", "website": "https://www.premiercooperative.com/", "location": "Reinbeck, IA", "source": "web_search"},
-        {"name": "Stateline Cooperative", "website": "https://www.statelinecoop.com/", "location": "Larchwood, IA", "source": "web_search"},
-
-        # Credit Unions (with known websites)
-        {"name": "Veridian Credit Union", "website": "https://www.veridiancu.org/", "location": "Waterloo, IA", "source": "web_search"},
-        {"name": "Collins Community Credit Union", "website": "https://www.collinscu.org/", "location": "Cedar Rapids, IA", "source": "web_search"},
-        {"name": "DuPont Community Credit Union", "website": "https://www.dupontccu.org/", "location": "Fort Madison, IA", "source": "web_search"},
-        {"name": "Ascentra Credit Union", "website": "https://www.ascentra.org/", "location": "Davenport, IA", "source": "web_search"},
-        {"name": "GreenState Credit Union", "website": "https://www.greenstate.org/", "location": "North Liberty, IA", "source": "web_search"},
-        {"name": "Community Choice Credit Union", "website": "https://www.communitychoicecu.com/", "location": "Johnston, IA", "source": "web_search"},
-
-        # Telecom Cooperatives
-        {"name": "Farmers Mutual Telephone Company", "website": "https://www.fmtc.coop/", "location": "Bellingham, IA", "source": "web_search"},
-        {"name": "Winnebago Cooperative Telecom Association", "website": "https://www.wctatel.net/", "location": "Lake Mills, IA", "source": "web_search"},
-        {"name": "Coon Valley Telecommunications Cooperative", "website": "https://www.coonvalleytelco.com/", "location": "Manning, IA", "source": "web_search"},
-        {"name": "Northeast Iowa Telephone Company", "website": "https://www.neitel.com/", "location": "Monona, IA", "source": "web_search"},
-        {"name": "Mahaska Communication Group", "website": "https://www.mahaska.org/", "location": "Oskaloosa, IA", "source": "web_search"},
-
-        # Food Cooperatives
-        {"name": "New Pioneer Food Co-op", "website": "https://www.newpi.coop/", "location": "Iowa City, IA", "source": "web_search"},
-        {"name": "Wheatsfield Cooperative", "website": "https://www.wheatsfield.coop/", "location": "Ames, IA", "source": "web_search"},
-        {"name": "Oneota Community Food Co-op", "website": "https://www.oneotacoop.com/", "location": "Decorah, IA", "source": "web_search"},
-
-        # Housing Cooperatives
-        {"name": "River Hills Cooperative", "website": "https://www.riverhillscoop.org/", "location": "Des Moines, IA", "source": "web_search"},
-    ]
-
-    return coops
-
-
-def deduplicate_candidates(candidates, verified_identifiers):
-    """Remove candidates that are already verified."""
-    deduped = []
-    seen = set()
+    return ADDITIONAL_COOPERATIVES
+
+
+def name_tokens(name_norm: str) -> frozenset:
+    """Words of a normalized name, with abbreviations expanded and filler dropped."""
+    tokens = set()
+    for word in name_norm.split():
+        tokens.update(NAME_TOKEN_ALIASES.get(word, (word,)))
+    return frozenset(tokens - NAME_FILLER_TOKENS)
+
+
+def name_similarity(a: frozenset, b: frozenset) -> float:
+    """Similarity (0-1) of two sets of name tokens, ignoring word order."""
+    return SequenceMatcher(None, " ".join(sorted(a)), " ".join(sorted(b))).ratio()
 
-    for c in candidates:
-        name_norm = normalize_name(c['name'])
-        domain = extract_domain(c.get('website', '')) if c.get('website') else None
 
+def same_place(a: str, b: str) -> bool:
+    """Whether two locations are the same place."""
+    return a.lower() == b.lower()
+
+
+def deduplicate_candidates(candidates, verified_identifiers, verbose=False):
+    """Remove candidates that are already verified.
+
+    Skips are tallied by reason and summarized at the end; with verbose,
+    each skipped candidate is also printed.
+    """
+    deduped = []
+    seen = {}  # normalized name -> first candidate kept with it
+    skipped = Counter()
+    # Distinctive name token -> indexes into deduped, so each candidate is
+    # only compared with the few kept names it shares a token with
+    token_index = {}
+    kept_tokens = []
+    kept_domains = []
+
+    # Normalize keys once up front so the loop below only does set lookups
+    names = map(normalize_name, map(itemgetter('name'), candidates))
+    domains = map(extract_domain, [c.get('website') or '' for c in candidates])
+    prepped = list(zip(names, domains, candidates))
+
+    for name_norm, domain, c in prepped:
         # Skip if already verified
         if name_norm in verified_identifiers:
-            print(f"  Skipping (verified): {c['name']}")
+            skipped['verified'] += 1
+            if verbose:
+                print(f"  Skipping (verified): {c['name']}")
             continue
         if domain and domain in verified_identifiers:
-            print(f"  Skipping (domain match): {c['name']}")
+            skipped['domain match'] += 1
+            if verbose:
+                print(f"  Skipping (domain match): {c['name']}")
+            continue
+
+        # Skip duplicates within candidates (one hash lookup both tests and
+        # records the name)
+        if seen.setdefault(name_norm, c) is not c:
+            skipped['duplicate'] += 1
+            if verbose:
+                print(f"  Skipping (duplicate of {seen[name_norm]['name']}): {c['name']}")
             continue
 
-        # Skip duplicates within candidates
-        key = name_norm
-        if key in seen:
+        # Skip near-duplicates ("Veridian CU" vs "Veridian Credit Union");
+        # candidates with different websites are never merged
+        tokens = name_tokens(name_norm)
+        nearby = sorted({i for token in tokens - NAME_TYPE_TOKENS for i in token_index.get(token, ())})
+        match = next((
+            deduped[i] for i in nearby
+            if not (domain and kept_domains[i] and domain != kept_domains[i])
+            and same_place(c.get('location', ''), deduped[i].get('location', ''))
+            and name_similarity(tokens, kept_tokens[i]) >= NEAR_DUPLICATE_THRESHOLD
+        ), None)
+        if match:
+            skipped['near-duplicate'] += 1
+            if verbose:
+                print(f"  Skipping (near-duplicate of {match['name']}): {c['name']}")
             continue
-        seen.add(key)
 
+        for token in tokens - NAME_TYPE_TOKENS:
+            token_index.setdefault(token, []).append(len(deduped))
+        kept_tokens.append(tokens)
+        kept_domains.append(domain)
         deduped.append(c)
 
+    for reason, count in skipped.items():
+        print(f"  Skipped ({reason}): {count}")
+
     return deduped
 
 
+def check_website(session, url: str) -> str | None:
+    """Request a website; return an error message, or None if it responds."""
+    try:
+        response = session.head(url, headers=HEADERS, timeout=CHECK_TIMEOUT, allow_redirects=True)
+        if response.status_code in (403, 405, 501):
+            # Some servers reject HEAD; retry with a streamed GET (body unread)
+            response = session.get(url, headers=HEADERS, timeout=CHECK_TIMEOUT, allow_redirects=True, stream=True)
+            response.close()
+        response.raise_for_status()
+        return None
+    except requests.RequestException as e:
+        return str(e)
+
+
+def check_websites(candidates):
+    """Check candidate websites concurrently.
+
+    Candidates whose website doesn't respond are returned as copies marked
+    needs_website, with the error recorded; the rest are returned unchanged.
+    """
+    to_check = [c for c in candidates if c.get('website') and not c.get('needs_website')]
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=CHECK_WORKERS) as executor:
+        errors = dict(zip(
+            (id(c) for c in to_check),
+            executor.map(lambda c: check_website(session, c['website']), to_check)
+        ))
+
+    checked = []
+    for c in candidates:
+        error = errors.get(id(c))
+        if error:
+            print(f"  Unreachable: {c['name']} ({c['website']})")
+            c = {**c, 'needs_website': True, 'website_error': error}
+        checked.append(c)
+    return checked
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Fetch candidate cooperatives')
+    parser.add_argument('--check-websites', action='store_true', help='Move unreachable websites to the lookup list')
+    parser.add_argument('--verbose', action='store_true', help='List every skipped candidate')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("FETCHING COOPERATIVE CANDIDATES")
     print("=" * 60)
 
     # Load labeled data for deduplication
     print("\nLoading labeled data...")
-    labeled_data = load_labeled_data()
-    verified_ids = get_verified_identifiers(labeled_data)
-    print(f"Found {len(labeled_data['verified_cooperatives'])} verified cooperatives")
+    verified_ids, verified_count = load_verified_identifiers()
+    print(f"Found {verified_count} verified cooperatives")
 
     all_candidates = []
 
@@ -274,34 +423,43 @@ def main():
     # Deduplicate
     print("\n" + "-" * 40)
     print("Deduplicating candidates...")
-    candidates = deduplicate_candidates(all_candidates, verified_ids)
+    candidates = deduplicate_candidates(all_candidates, verified_ids, args.verbose)
     print(f"After deduplication: {len(candidates)} candidates")
 
+    if args.check_websites:
+        print("\n" + "-" * 40)
+        print("Checking candidate websites...")
+        candidates = check_websites(candidates)
+
     # Separate by whether they have websites
-    with_websites = [c for c in candidates if c.get('website') and not c.get('needs_website')]
-    needs_websites = [c for c in candidates if c.get('needs_website') or not c.get('website')]
+    with_websites = []
+    needs_websites = []
+    for c in candidates:
+        if c.get('website') and not c.get('needs_website'):
+            with_websites.append(c)
+        else:
+            needs_websites.append(c)
 
     print(f"\n  With websites (ready for ML): {len(with_websites)}")
     print(f"  Need website lookup: {len(needs_websites)}")
 
     # Save candidates
     print(f"\nSaving to {CANDIDATES_FILE}")
-    with open(CANDIDATES_FILE, 'w') as f:
-        json.dump(candidates, f, indent=2)
+    write_json_array(candidates, CANDIDATES_FILE)
 
     # Also save a separate file for candidates that need website lookup
     needs_website_file = DATA_DIR / "candidates_need_websites.json"
-    with open(needs_website_file, 'w') as f:
-        json.dump(needs_websites, f, indent=2)
+    write_json_array(needs_websites, needs_website_file)
     print(f"Saved candidates needing websites to {needs_website_file}")
 
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
+    source_counts = Counter(c.get('source') for c in candidates)
     print(f"Total candidates: {len(candidates)}")
-    print(f"  - NCUA credit unions: {len([c for c in candidates if c.get('source') == 'ncua'])}")
-    print(f"  - IAEC electric coops: {len([c for c in candidates if c.get('source') == 'iaec'])}")
-    print(f"  - Other sources: {len([c for c in candidates if c.get('source') not in ['ncua', 'iaec']])}")
+    print(f"  - NCUA credit unions: {source_counts['ncua']}")
+    print(f"  - IAEC electric coops: {source_counts['iaec']}")
+    print(f"  - Other sources: {len(candidates) - source_counts['ncua'] - source_counts['iaec']}")
     print("\nNEXT STEPS:")
     print("1. Look up websites for candidates in candidates_need_websites.json")
     print("2. Run: python scripts/scrape_websites.py (to extract content)")
@@ -10,13 +10,14 @@ Data sources:
 This script provides utilities to process and deduplicate candidates.
 """
 
-import json
 import re
 from pathlib import Path
 
 import requests
 from bs4 import BeautifulSoup
 
+from coop_utils import extract_domain, load_json, normalize_name, save_json
+
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 VERIFIED_FILE = DATA_DIR / "verified_cooperatives.json"
@@ -35,11 +36,15 @@ IOWA_INDICATORS = [
     ", ia", ", iowa", "iowa"
 ]
 
+# Each keyword list as one alternation, so a text is scanned once per list
+# instead of once per keyword
+COOP_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, COOP_KEYWORDS)), re.IGNORECASE)
+IOWA_INDICATOR_PATTERN = re.compile("|".join(map(re.escape, IOWA_INDICATORS)), re.IGNORECASE)
+
 
 def load_verified_cooperatives() -> set:
     """Load names of already verified cooperatives."""
-    with open(VERIFIED_FILE) as f:
-        coops = json.load(f)
+    coops = load_json(VERIFIED_FILE)
 
     # Create set of normalized names for deduplication
     names = set()
@@ -54,41 +59,14 @@ def load_verified_cooperatives() -> set:
     return names
 
 
-def normalize_name(name: str) -> str:
-    """Normalize business name for comparison."""
-    name = name.lower()
-    # Remove common suffixes
-    for suffix in [", inc", " inc", ", llc", " llc", ", ltd", " ltd", "."]:
-        name = name.replace(suffix, "")
-    # Remove extra whitespace
-    name = " ".join(name.split())
-    return name
-
-
-def extract_domain(url: str) -> str | None:
-    """Extract domain from URL."""
-    try:
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        # Remove www prefix
-        if domain.startswith("www."):
-            domain = domain[4:]
-        return domain
-    except:
-        return None
-
-
 def is_likely_cooperative(name: str, description: str = "") -> bool:
     """Check if a business name/description suggests it's a cooperative."""
-    text = f"{name} {description}".lower()
-    return any(kw in text for kw in COOP_KEYWORDS)
+    return COOP_KEYWORD_PATTERN.search(f"{name} {description}") is not None
 
 
 def is_iowa_business(location: str) -> bool:
     """Check if location indicates Iowa."""
-    location = location.lower()
-    return any(ind in location for ind in IOWA_INDICATORS)
+    return IOWA_INDICATOR_PATTERN.search(location) is not None
 
 
 def search_usda_cooperatives():
@@ -140,15 +118,27 @@ def process_sos_export(filepath: str) -> list[dict]:
 
     try:
         with open(filepath, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            # Positional rows: the name is checked on the raw row, and fields
+            # are only pulled out for the few rows that look like co-ops
+            reader = csv.reader(f)
+            header = next(reader, [])
+            column = {name: i for i, name in enumerate(header)}
+            name_idx = column.get('Business Name', column.get('Name'))
+            city_idx = column.get('City')
+            status_idx = column.get('Status')
+            if name_idx is None:
+                return candidates
+
             for row in reader:
-                name = row.get('Business Name', row.get('Name', ''))
+                name = row[name_idx] if name_idx < len(row) else ''
                 if is_likely_cooperative(name):
+                    city = row[city_idx] if city_idx is not None and city_idx < len(row) else ''
+                    status = row[status_idx] if status_idx is not None and status_idx < len(row) else 'unknown'
                     candidates.append({
                         "name": name,
-                        "location": row.get('City', '') + ", IA",
+                        "location": city + ", IA",
                         "source": "iowa_sos",
-                        "status": row.get('Status', 'unknown'),
+                        "status": status,
                         "website": None  # Would need to be looked up
                     })
     except FileNotFoundError:
@@ -302,8 +292,7 @@ def main():
 
     # Save candidates
     print(f"\nSaving candidates to {CANDIDATES_FILE}")
-    with open(CANDIDATES_FILE, "w") as f:
-        json.dump(candidates, f, indent=2)
+    save_json(candidates, CANDIDATES_FILE)
 
     print("\n" + "="*60)
     print("NEXT STEPS")
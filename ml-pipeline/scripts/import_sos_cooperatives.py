@@ -6,21 +6,23 @@ These are cooperatives registered with official cooperative corporation types,
 so they don't need similarity scoring - they're definitively cooperatives.
 """
 
-import json
+import re
 from datetime import datetime
 from pathlib import Path
 
+from coop_utils import get_verified_names, load_json, save_json
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 SOS_CANDIDATES_FILE = DATA_DIR / "sos_candidates.json"
 LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 
 # Corporation types that definitively indicate a cooperative
-COOP_CORP_TYPES = [
+COOP_CORP_TYPES = frozenset({
     "CO-OP NON STOCK",
     "CO-OP STOCK",
     "DOMESTIC COOPERATIVE",
     "CO-OP STOCK VALUE ADDED",
-]
+})
 
 # High-confidence name patterns
 HIGH_CONF_PATTERNS = [
@@ -37,42 +39,41 @@ HIGH_CONF_PATTERNS = [
     'food cooperative',
 ]
 
+# Name substrings that decide the category, checked in priority order
+CATEGORY_KEYWORDS = [
+    ('electric', ['electric', 'power']),
+    ('telecom', ['telephone', 'telecom', 'communications']),
+    ('credit', ['credit union']),
+    ('agricultural', ['farm', 'grain', 'elevator', 'seed', 'agri', 'dairy', 'livestock']),
+    ('food', ['food', 'market', 'grocery']),
+    ('housing', ['housing', 'home']),
+]
+CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in CATEGORY_KEYWORDS
+]
+
 
 def determine_category(name: str, hint: str) -> str:
     """Determine category from name and hint."""
     name_lower = name.lower()
 
-    if 'electric' in name_lower or 'power' in name_lower:
-        return 'electric'
-    elif 'telephone' in name_lower or 'telecom' in name_lower or 'communications' in name_lower:
-        return 'telecom'
-    elif 'credit union' in name_lower:
-        return 'credit'
-    elif any(kw in name_lower for kw in ['farm', 'grain', 'elevator', 'seed', 'agri', 'dairy', 'livestock']):
-        return 'agricultural'
-    elif 'food' in name_lower or 'market' in name_lower or 'grocery' in name_lower:
-        return 'food'
-    elif 'housing' in name_lower or 'home' in name_lower:
-        return 'housing'
-    elif hint != 'other':
-        return hint
-    else:
-        return 'other'
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(name_lower):
+            return category
+
+    # Fall back to the hint from process_iowa_sos
+    return hint
 
 
 def main():
     print("Loading data...")
 
-    with open(SOS_CANDIDATES_FILE) as f:
-        sos_candidates = json.load(f)
-
-    with open(LABELED_DATA_PATH) as f:
-        labeled_data = json.load(f)
+    sos_candidates = load_json(SOS_CANDIDATES_FILE)
+    labeled_data = load_json(LABELED_DATA_PATH)
 
     # Get existing verified names to avoid duplicates
-    verified_names = set()
-    for c in labeled_data['verified_cooperatives']:
-        verified_names.add(c['name'].lower().strip())
+    verified_names = get_verified_names(labeled_data)
 
     print(f"SoS candidates: {len(sos_candidates)}")
     print(f"Currently verified: {len(labeled_data['verified_cooperatives'])}")
@@ -95,13 +96,15 @@ def main():
     # Get max ID
     max_id = max(c['id'] for c in labeled_data['verified_cooperatives'])
 
-    # Add to verified list
+    # Add to verified list, with one timestamp for the whole import
+    now = datetime.now().isoformat()
     added = 0
     skipped_dup = 0
 
     for c in high_conf:
         # Check for duplicate
-        if c['name'].lower().strip() in verified_names:
+        norm_name = c['name'].lower().strip()
+        if norm_name in verified_names:
             skipped_dup += 1
             continue
 
@@ -114,27 +117,26 @@ def main():
             'category': category,
             'website': None,  # No website from SoS data
             'location': c.get('location', 'Iowa'),
-            'verified_date': datetime.now().isoformat(),
+            'verified_date': now,
             'source': 'iowa_sos',
             'corp_type': c.get('corp_type'),
             'corp_number': c.get('corp_number'),
         }
 
         labeled_data['verified_cooperatives'].append(new_coop)
-        verified_names.add(c['name'].lower().strip())
+        verified_names.add(norm_name)
         added += 1
 
     # Update stats
     labeled_data['stats']['total_verified'] = len(labeled_data['verified_cooperatives'])
-    labeled_data['metadata']['last_updated'] = datetime.now().isoformat()
+    labeled_data['metadata']['last_updated'] = now
 
     # Save
     print(f"\nAdded: {added}")
     print(f"Skipped (duplicate): {skipped_dup}")
     print(f"New total verified: {labeled_data['stats']['total_verified']}")
 
-    with open(LABELED_DATA_PATH, 'w') as f:
-        json.dump(labeled_data, f, indent=2)
+    save_json(labeled_data, LABELED_DATA_PATH)
 
     print(f"\nSaved to {LABELED_DATA_PATH}")
 
@@ -6,10 +6,11 @@ This script finds cooperatives that were marked as unclear/other and helps
 investigate them one by one to determine proper categorization.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+from coop_utils import get_verified_names, index_by_name, load_json
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 SOS_CANDIDATES_FILE = DATA_DIR / "sos_candidates.json"
 LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
@@ -67,34 +68,20 @@ UNCLEAR_COOPS = [
     "UPPER IOWA COOPERATIVE",
 ]
 
-
-def get_sos_info(name: str, sos_candidates: list) -> dict:
-    """Get SoS info for a cooperative."""
-    for c in sos_candidates:
-        if c['name'] == name:
-            return c
-    return {}
-
-
-def get_verified_names(labeled_data: dict) -> set:
-    """Get set of normalized names from verified cooperatives."""
-    names = set()
-    for coop in labeled_data['verified_cooperatives']:
-        names.add(coop['name'].lower().strip())
-    return names
+# Towns whose namesake co-ops are likely agricultural (grain elevators)
+TOWN_NAMES = ('aspinwall', 'buckingham', 'eagle grove', 'goldfield', 'hull')
 
 
 def restore_coops():
     """Restore the removed cooperatives and show their info for investigation."""
 
     print("Loading data...")
-    with open(SOS_CANDIDATES_FILE) as f:
-        sos_candidates = json.load(f)
+    sos_candidates = load_json(SOS_CANDIDATES_FILE)
 
-    with open(LABELED_DATA_PATH) as f:
-        labeled_data = json.load(f)
+    labeled_data = load_json(LABELED_DATA_PATH)
 
     verified_names = get_verified_names(labeled_data)
+    sos_by_name = index_by_name(sos_candidates)
     max_id = max(c['id'] for c in labeled_data['verified_cooperatives'])
 
     print(f"Current verified count: {len(labeled_data['verified_cooperatives'])}")
@@ -105,7 +92,7 @@ def restore_coops():
     missing = []
     for name in UNCLEAR_COOPS:
         if name.lower().strip() not in verified_names:
-            info = get_sos_info(name, sos_candidates)
+            info = sos_by_name.get(name, {})
             missing.append((name, info))
 
     print(f"Missing from verified (need restoration): {len(missing)}")
@@ -128,8 +115,8 @@ def show_investigation_details():
     """Show detailed info for investigation."""
 
     print("Loading SoS candidates...")
-    with open(SOS_CANDIDATES_FILE) as f:
-        sos_candidates = json.load(f)
+    sos_candidates = load_json(SOS_CANDIDATES_FILE)
+    sos_by_name = index_by_name(sos_candidates)
 
     print()
     print("=" * 80)
@@ -146,7 +133,7 @@ def show_investigation_details():
     other = []       # Need web research
 
     for name in UNCLEAR_COOPS:
-        info = get_sos_info(name, sos_candidates)
+        info = sos_by_name.get(name, {})
         name_lower = name.lower()
 
         # Check patterns
@@ -158,7 +145,7 @@ def show_investigation_details():
             worker.append((name, info))
         elif 'resources' in name_lower or 'ethanol' in name_lower:
             resources.append((name, info))
-        elif any(town in name_lower for town in ['aspinwall', 'buckingham', 'eagle grove', 'goldfield', 'hull']):
+        elif any(town in name_lower for town in TOWN_NAMES):
             town_named.append((name, info))
         else:
             other.append((name, info))
@@ -5,24 +5,37 @@ Process Iowa Secretary of State business entity data to find cooperatives.
 Source: https://data.iowa.gov/Regulation/Active-Iowa-Business-Entities/ez5t-3qay
 """
 
-import csv
-import json
+import os
 import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import pandas as pd
+
+from coop_utils import get_verified_names, load_json, write_json_array
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 SOS_FILE = DATA_DIR / "iowa_business_entities.csv"
 LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 CANDIDATES_FILE = DATA_DIR / "candidates.json"
 OUTPUT_FILE = DATA_DIR / "sos_candidates.json"
 
+# Columns of the SoS export used below
+SOS_COLUMNS = ['Corp Number', 'Legal Name', 'Corporation Type', 'HO City', 'RA City']
+
+# Rows per chunk handed to scan_chunk; exports smaller than the threshold
+# are scanned in-process, larger ones across a process pool
+SCAN_CHUNK_ROWS = 200_000
+PARALLEL_THRESHOLD_BYTES = 50_000_000
+
 # Corporation types that are explicitly cooperatives
-COOP_CORP_TYPES = [
+COOP_CORP_TYPES = frozenset({
     "CO-OP NON STOCK",
     "CO-OP STOCK",
     "DOMESTIC COOPERATIVE",
     "CO-OP STOCK VALUE ADDED",
-]
+})
 
 # Keywords in business names that suggest cooperatives
 COOP_KEYWORDS = [
@@ -37,6 +50,23 @@ COOP_KEYWORDS = [
     "telecom cooperative",
 ]
 
+# Name substrings that hint at a category, checked in priority order
+CATEGORY_KEYWORDS = [
+    ("electric", ["electric", "power"]),
+    ("telecom", ["telephone", "telecom"]),
+    ("credit", ["credit union"]),
+    ("agricultural", ["farm", "grain", "elevator", "seed", "agri", "dairy"]),
+    ("food", ["food", "market", "grocery"]),
+]
+
+# One alternation per keyword list, so each name is scanned once in C rather
+# than once per keyword with `in`
+COOP_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, COOP_KEYWORDS)))
+CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in CATEGORY_KEYWORDS
+]
+
 # Exclude these patterns (not the cooperatives we're looking for)
 EXCLUDE_PATTERNS = [
     r"housing",
@@ -57,11 +87,12 @@ EXCLUDE_PATTERNS = [
     r"blue sky",
     r"properties cooperative",
 ]
+EXCLUDE_PATTERN = re.compile("|".join(f"(?:{pattern})" for pattern in EXCLUDE_PATTERNS))
 
 # Corporation types to EXCLUDE (housing-related)
-EXCLUDE_CORP_TYPES = [
+EXCLUDE_CORP_TYPES = frozenset({
     "MULTIPLE HOUSING ACT",
-]
+})
 
 
 def normalize_name(name: str) -> str:
@@ -74,24 +105,12 @@ def normalize_name(name: str) -> str:
 
 def is_excluded(name: str) -> bool:
     """Check if name matches exclusion patterns."""
-    name_lower = name.lower()
-    return any(re.search(pat, name_lower) for pat in EXCLUDE_PATTERNS)
-
-
-def get_verified_names(labeled_data):
-    """Get set of normalized names from verified cooperatives."""
-    names = set()
-    for coop in labeled_data['verified_cooperatives']:
-        names.add(normalize_name(coop['name']))
-    return names
+    return EXCLUDE_PATTERN.search(name.lower()) is not None
 
 
 def get_existing_candidate_names(candidates):
     """Get set of normalized names from existing candidates."""
-    names = set()
-    for c in candidates:
-        names.add(normalize_name(c['name']))
-    return names
+    return {normalize_name(c['name']) for c in candidates}
 
 
 def extract_city_from_address(row):
@@ -105,17 +124,115 @@ def extract_city_from_address(row):
     return city if city else "Iowa"
 
 
+def scan_chunk(df):
+    """Pick the cooperative rows out of a chunk of the SoS export.
+
+    Returns (cooperative rows, their category hints, rows scanned, matches
+    by corp type, matches by name keyword).
+    """
+    df = df.reindex(columns=SOS_COLUMNS, fill_value='')
+    df['Legal Name'] = df['Legal Name'].str.strip()
+    df['Corporation Type'] = df['Corporation Type'].str.strip()
+    names_lower = df['Legal Name'].str.lower()
+
+    # Check if it's a cooperative by corporation type or by name keywords
+    is_coop_type = df['Corporation Type'].isin(COOP_CORP_TYPES)
+    is_coop_name = names_lower.str.contains(COOP_KEYWORD_PATTERN)
+
+    # Skip unnamed rows and excluded corporation types (like housing)
+    keep = (
+        (df['Legal Name'] != '')
+        & ~df['Corporation Type'].isin(EXCLUDE_CORP_TYPES)
+        & (is_coop_type | is_coop_name)
+    )
+
+    # Determine category hints from the names: the first category (in
+    # priority order) whose keywords appear. Each rule only scans the names
+    # no earlier rule matched.
+    categories = pd.Series('other', index=names_lower.index[keep], dtype=object)
+    remaining = names_lower[keep]
+    for category, pattern in CATEGORY_PATTERNS:
+        if remaining.empty:
+            break
+        matched = remaining.str.contains(pattern)
+        categories[matched.index[matched]] = category
+        remaining = remaining[~matched]
+
+    return df[keep], categories.tolist(), len(df), int(is_coop_type[keep].sum()), int(is_coop_name[keep].sum())
+
+
+def iter_new_candidates(rows, verified_names, existing_names, stats):
+    """Yield candidates for (row, category hint) pairs of cooperative rows.
+
+    Rows that are excluded or already known are skipped and counted in stats.
+    """
+    for row, category in rows:
+        name = row['Legal Name']
+        corp_type = row['Corporation Type']
+
+        # Check exclusions
+        if is_excluded(name):
+            stats['excluded'] += 1
+            continue
+
+        # Check if already verified
+        norm_name = normalize_name(name)
+        if norm_name in verified_names:
+            stats['already_verified'] += 1
+            continue
+
+        # Check if already a candidate
+        if norm_name in existing_names:
+            stats['already_candidate'] += 1
+            continue
+
+        # Extract location
+        city = extract_city_from_address(row)
+        location = f"{city}, IA" if city != "Iowa" else "Iowa"
+
+        candidate = {
+            'name': name,
+            'website': None,
+            'location': location,
+            'source': 'iowa_sos',
+            'corp_type': corp_type,
+            'corp_number': row.get('Corp Number', ''),
+            'category_hint': category,
+            'needs_website': True,
+        }
+
+        existing_names.add(norm_name)  # Prevent duplicates within this run
+        stats['new_candidates'] += 1
+        yield candidate
+
+
+def scan_chunks_in_pool(reader):
+    """Scan chunks in worker processes, yielding results in file order.
+
+    Executor.map would read and submit every chunk up front; here only a
+    bounded window of chunks is parsed and in flight at a time, and the next
+    one is read as the oldest finishes.
+    """
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for chunk in reader:
+            window.append(pool.submit(scan_chunk, chunk))
+            if len(window) >= 2 * workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
 def process_sos_data():
     """Process Iowa SoS data and extract cooperatives."""
 
     print("Loading labeled data and existing candidates...")
-    with open(LABELED_DATA_PATH) as f:
-        labeled_data = json.load(f)
+    labeled_data = load_json(LABELED_DATA_PATH)
 
-    with open(CANDIDATES_FILE) as f:
-        existing_candidates = json.load(f)
+    existing_candidates = load_json(CANDIDATES_FILE)
 
-    verified_names = get_verified_names(labeled_data)
+    verified_names = get_verified_names(labeled_data, normalize_name)
     existing_names = get_existing_candidate_names(existing_candidates)
 
     print(f"  Verified cooperatives: {len(verified_names)}")
@@ -123,7 +240,6 @@ def process_sos_data():
 
     print(f"\nProcessing {SOS_FILE}...")
 
-    candidates = []
     stats = {
         'total_rows': 0,
         'coop_by_type': 0,
@@ -134,89 +250,47 @@ def process_sos_data():
         'new_candidates': 0,
     }
 
-    with open(SOS_FILE, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            stats['total_rows'] += 1
-
-            name = row.get('Legal Name', '').strip()
-            corp_type = row.get('Corporation Type', '').strip()
-
-            if not name:
-                continue
-
-            # Skip excluded corporation types (like housing)
-            if corp_type in EXCLUDE_CORP_TYPES:
-                continue
-
-            # Check if it's a cooperative by corporation type
-            is_coop_type = corp_type in COOP_CORP_TYPES
-
-            # Check if it's a cooperative by name keywords
-            name_lower = name.lower()
-            is_coop_name = any(kw in name_lower for kw in COOP_KEYWORDS)
-
-            if not (is_coop_type or is_coop_name):
-                continue
-
-            if is_coop_type:
-                stats['coop_by_type'] += 1
-            if is_coop_name:
-                stats['coop_by_name'] += 1
-
-            # Check exclusions
-            if is_excluded(name):
-                stats['excluded'] += 1
-                continue
-
-            # Check if already verified
-            norm_name = normalize_name(name)
-            if norm_name in verified_names:
-                stats['already_verified'] += 1
-                continue
-
-            # Check if already a candidate
-            if norm_name in existing_names:
-                stats['already_candidate'] += 1
-                continue
-
-            # Extract location
-            city = extract_city_from_address(row)
-            location = f"{city}, IA" if city != "Iowa" else "Iowa"
-
-            # Determine category based on name
-            category = 'other'
-            if 'electric' in name_lower or 'power' in name_lower:
-                category = 'electric'
-            elif 'telephone' in name_lower or 'telecom' in name_lower:
-                category = 'telecom'
-            elif 'credit union' in name_lower:
-                category = 'credit'
-            elif any(kw in name_lower for kw in ['farm', 'grain', 'elevator', 'seed', 'agri', 'dairy']):
-                category = 'agricultural'
-            elif 'food' in name_lower or 'market' in name_lower or 'grocery' in name_lower:
-                category = 'food'
-
-            candidate = {
-                'name': name,
-                'website': None,
-                'location': location,
-                'source': 'iowa_sos',
-                'corp_type': corp_type,
-                'corp_number': row.get('Corp Number', ''),
-                'category_hint': category,
-                'needs_website': True,
-            }
-
-            candidates.append(candidate)
-            existing_names.add(norm_name)  # Prevent duplicates within this run
-            stats['new_candidates'] += 1
+    # Parse only the needed columns in C, in chunks that are scanned for
+    # cooperatives in worker processes when the export is large
+    reader = pd.read_csv(
+        SOS_FILE,
+        usecols=lambda column: column in SOS_COLUMNS,
+        dtype=str,
+        keep_default_na=False,
+        encoding='utf-8',
+        chunksize=SCAN_CHUNK_ROWS
+    )
+    if SOS_FILE.stat().st_size < PARALLEL_THRESHOLD_BYTES:
+        results = list(map(scan_chunk, reader))
+    else:
+        results = list(scan_chunks_in_pool(reader))
+
+    kept = pd.concat([r[0] for r in results]) if results else pd.DataFrame(columns=SOS_COLUMNS)
+    categories = [category for r in results for category in r[1]]
+    stats['total_rows'] = sum(r[2] for r in results)
+    stats['coop_by_type'] = sum(r[3] for r in results)
+    stats['coop_by_name'] = sum(r[4] for r in results)
+
+    # Rows are turned into dicts and candidates one at a time and streamed
+    # straight to the output file
+    rows = zip(
+        (dict(zip(SOS_COLUMNS, values)) for values in kept.itertuples(index=False, name=None)),
+        categories
+    )
+    cat_counts = Counter()
+    samples = []
+
+    def track(candidates):
+        for c in candidates:
+            cat_counts[c['category_hint']] += 1
+            if len(samples) < 15:
+                samples.append(c)
+            yield c
 
     # Save SoS-specific candidates
-    print(f"\nSaving {len(candidates)} new candidates to {OUTPUT_FILE}")
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(candidates, f, indent=2)
+    print(f"\nSaving new candidates to {OUTPUT_FILE}")
+    write_json_array(track(iter_new_candidates(rows, verified_names, existing_names, stats)), OUTPUT_FILE)
+    print(f"Saved {stats['new_candidates']} new candidates")
 
     # Print stats
     print("\n" + "="*60)
@@ -232,18 +306,16 @@ def process_sos_data():
 
     # Category breakdown
     print("\nNew candidates by category hint:")
-    from collections import Counter
-    cat_counts = Counter(c['category_hint'] for c in candidates)
     for cat, count in cat_counts.most_common():
         print(f"  {cat}: {count}")
 
     print("\n" + "="*60)
     print("SAMPLE NEW CANDIDATES")
     print("="*60)
-    for c in candidates[:15]:
+    for c in samples:
         print(f"  {c['name'][:50]:<50} ({c['category_hint']})")
 
-    return candidates
+    return stats
 
 
 if __name__ == "__main__":
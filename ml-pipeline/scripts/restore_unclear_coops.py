@@ -8,9 +8,11 @@ Research findings summary:
 - Found specific categories for many via web search
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
+from collections import Counter
+
+from coop_utils import index_by_name, load_json, save_json
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 SOS_CANDIDATES_FILE = DATA_DIR / "sos_candidates.json"
@@ -91,42 +93,28 @@ EXCLUDE = [
 ]
 
 
-def get_sos_info(name: str, sos_candidates: list) -> dict:
-    """Get SoS info for a cooperative."""
-    for c in sos_candidates:
-        if c['name'] == name:
-            return c
-    return {}
-
-
-def get_verified_names(labeled_data: dict) -> set:
-    """Get set of names from verified cooperatives."""
-    names = set()
-    for coop in labeled_data['verified_cooperatives']:
-        names.add(coop['name'])
-    return names
-
-
 def main():
     print("Loading data...")
-    with open(SOS_CANDIDATES_FILE) as f:
-        sos_candidates = json.load(f)
+    sos_candidates = load_json(SOS_CANDIDATES_FILE)
 
-    with open(LABELED_DATA_PATH) as f:
-        labeled_data = json.load(f)
+    labeled_data = load_json(LABELED_DATA_PATH)
 
-    verified_names = get_verified_names(labeled_data)
+    verified_names = {c['name'] for c in labeled_data['verified_cooperatives']}
+    sos_by_name = index_by_name(sos_candidates)
     max_id = max(c['id'] for c in labeled_data['verified_cooperatives'])
 
     print(f"Current verified count: {len(labeled_data['verified_cooperatives'])}")
     print()
 
+    # Category counts, kept up to date as cooperatives are added
+    cats = Counter(c['category'] for c in labeled_data['verified_cooperatives'])
+
     # Add 'utilities' and 'education' to categories if needed
-    existing_cats = set(c['category'] for c in labeled_data['verified_cooperatives'])
-    new_cats = {'utilities', 'education'} - existing_cats
+    new_cats = {'utilities', 'education'} - cats.keys()
     if new_cats:
         print(f"New categories to be added: {new_cats}")
 
+    now = datetime.now().isoformat()
     added = 0
     skipped_dup = 0
     excluded = 0
@@ -137,7 +125,7 @@ def main():
             skipped_dup += 1
             continue
 
-        info = get_sos_info(name, sos_candidates)
+        info = sos_by_name.get(name)
         if not info:
             print(f"  Warning: No SoS info found for {name}")
             continue
@@ -149,7 +137,7 @@ def main():
             'category': category,
             'website': None,
             'location': info.get('location', 'Iowa'),
-            'verified_date': datetime.now().isoformat(),
+            'verified_date': now,
             'source': 'iowa_sos',
             'corp_type': info.get('corp_type'),
             'corp_number': info.get('corp_number'),
@@ -157,6 +145,7 @@ def main():
 
         labeled_data['verified_cooperatives'].append(new_coop)
         verified_names.add(name)
+        cats[category] += 1
         added += 1
         print(f"  Added: {name} -> {category}")
 
@@ -167,13 +156,12 @@ def main():
 
     # Update stats
     labeled_data['stats']['total_verified'] = len(labeled_data['verified_cooperatives'])
-    labeled_data['metadata']['last_updated'] = datetime.now().isoformat()
+    labeled_data['metadata']['last_updated'] = now
 
     # Save
     print()
     print(f"Saving to {LABELED_DATA_PATH}...")
-    with open(LABELED_DATA_PATH, 'w') as f:
-        json.dump(labeled_data, f, indent=2)
+    save_json(labeled_data, LABELED_DATA_PATH)
 
     print()
     print("=" * 60)
@@ -185,8 +173,6 @@ def main():
     print(f"New total verified: {labeled_data['stats']['total_verified']}")
 
     # Category breakdown
-    from collections import Counter
-    cats = Counter(c['category'] for c in labeled_data['verified_cooperatives'])
     print()
     print("Category breakdown:")
     for cat, count in cats.most_common():
@@ -0,0 +1,178 @@
+"""
+Fetching and text extraction shared by the scraping scripts.
+
+scrape_websites.py and similarity_search.py both fetch pages through the
+pooled SESSION here.
+"""
+
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+import requests
+import trafilatura
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from trafilatura.settings import Extractor
+from urllib3.util import Retry
+
+from coop_utils import extract_domain, load_json, save_json
+
+# Request settings
+TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+HEADERS = {"User-Agent": USER_AGENT}
+
+# Connections kept per host; matches the scrapers' worker counts
+POOL_SIZE = 16
+
+# Requests to the same host start at least REQUEST_DELAY seconds apart;
+# different hosts aren't held back by each other
+REQUEST_DELAY = 0.5
+
+# Bodies are cut off here so a stray PDF or data dump isn't read whole
+MAX_CONTENT_BYTES = 5_000_000
+
+# Content types worth extracting text from
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Fetched pages are cached on disk, one JSON file per URL. Entries younger
+# than CACHE_MAX_AGE are reused without a request; older ones are revalidated
+# with their ETag / Last-Modified, so unchanged pages come back as a 304.
+CACHE_DIR = Path(__file__).parent.parent / "data" / ".cache" / "http"
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Extraction settings, built once and shared by every extract_text call.
+# fast skips trafilatura's readability/jusText fallback pass, which roughly
+# halves extraction time on typical co-op pages.
+EXTRACT_OPTIONS = Extractor(comments=False, tables=True, fast=True)
+
+# One pooled session for all requests, so connections (and TLS sessions) to
+# shared hosting are reused; transient errors are retried with backoff
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+SESSION.mount("http://", SESSION.get_adapter("https://"))
+
+# Earliest start time (time.monotonic) of the next request to each host
+NEXT_REQUEST_AT = {}
+NEXT_REQUEST_LOCK = threading.Lock()
+
+
+def read_text(response: requests.Response) -> str:
+    """Read and decode a streamed response body, up to MAX_CONTENT_BYTES."""
+    body = response.raw.read(MAX_CONTENT_BYTES, decode_content=True)
+    # Same decoding as response.text, without reading past the cap
+    encoding = response.encoding or chardet.detect(body)["encoding"]
+    try:
+        return str(body, encoding, errors="replace")
+    except (LookupError, TypeError):
+        return str(body, errors="replace")
+
+
+def pace_host(url: str):
+    """Wait until a request to url's host may start (thread-safe)."""
+    host = extract_domain(url) or url
+    with NEXT_REQUEST_LOCK:
+        now = time.monotonic()
+        start = max(now, NEXT_REQUEST_AT.get(host, now))
+        # Reserve the slot, then sleep outside the lock
+        NEXT_REQUEST_AT[host] = start + REQUEST_DELAY
+    time.sleep(start - now)
+
+
+def skip_reason(response: requests.Response) -> str | None:
+    """Why a response's body isn't worth downloading, from its headers alone."""
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        return f"not HTML ({content_type})"
+    content_length = response.headers.get("Content-Length", "")
+    if content_length.isdigit() and int(content_length) > MAX_CONTENT_BYTES:
+        return f"too large ({int(content_length):,} bytes)"
+    return None
+
+
+def cache_path(url: str) -> Path:
+    """Path of the cache entry for a URL."""
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def load_cached(url: str) -> dict | None:
+    """Load a URL's cache entry, or None if there isn't a readable one."""
+    try:
+        return load_json(cache_path(url))
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(url: str, entry: dict):
+    """Write a URL's cache entry (atomically, via save_json)."""
+    path = cache_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    save_json(entry, path)
+
+
+def fetch_url(url: str, refresh: bool = False) -> str | None:
+    """Fetch HTML content from URL, through the on-disk cache.
+
+    With refresh=True the cache is bypassed (but still updated). Requests
+    that do go out are paced per host (see pace_host).
+    """
+    entry = None if refresh else load_cached(url)
+    if entry and time.time() - entry["fetched_at"] < CACHE_MAX_AGE:
+        return entry["text"]
+    pace_host(url)
+
+    headers = HEADERS
+    if entry:
+        headers = {**HEADERS}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with SESSION.get(url, headers=headers, timeout=TIMEOUT, allow_redirects=True, stream=True) as response:
+            if entry and response.status_code == 304:
+                text = entry["text"]
+            else:
+                response.raise_for_status()
+                # Checked before the body is read, so skipped pages cost no
+                # more than a HEAD request
+                reason = skip_reason(response)
+                if reason:
+                    print(f"  Skipping {url}: {reason}")
+                    return None
+                text = read_text(response)
+            etag = response.headers.get("ETag") or (entry or {}).get("etag")
+            last_modified = response.headers.get("Last-Modified") or (entry or {}).get("last_modified")
+    except Exception as e:
+        print(f"  Error fetching {url}: {e}")
+        return None
+
+    # The page was fetched either way; a cache write failure (disk full,
+    # permissions) only costs a refetch next time
+    try:
+        store_cached(url, {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "text": text,
+        })
+    except OSError as e:
+        print(f"  Error caching {url}: {e}")
+    return text
+
+
+def extract_text(html: str, url: str) -> str | None:
+    """Extract main text content from HTML using trafilatura."""
+    try:
+        return trafilatura.extract(html, url=url, options=EXTRACT_OPTIONS)
+    except Exception as e:
+        print(f"  Error extracting text: {e}")
+        return None
@@ -1,67 +1,46 @@
 #!/usr/bin/env python3
 """
 Scrape text content from cooperative websites.
-Uses trafilatura for clean text extraction.
+Uses trafilatura for clean text extraction (see scrape_core.py).
 
 Can scrape either verified cooperatives or candidates.
 Usage:
     python scrape_websites.py              # Scrape verified cooperatives
     python scrape_websites.py --candidates # Scrape candidates with websites
+    python scrape_websites.py --refresh    # Re-scrape everything, ignoring cached pages
+
+Sites scraped successfully by an earlier run (same name and website in the
+existing output file) are carried over rather than scraped again.
 """
 
-import json
-import time
 import argparse
+from collections import defaultdict
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
-import trafilatura
 from tqdm import tqdm
 
+from coop_utils import dumps_line, extract_domain, load_json, load_jsonl
+from scrape_core import extract_text, fetch_url
+
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 COOPS_FILE = DATA_DIR / "verified_cooperatives.json"
 CANDIDATES_FILE = DATA_DIR / "candidates.json"
-OUTPUT_FILE = DATA_DIR / "cooperative_content.json"
-CANDIDATES_OUTPUT_FILE = DATA_DIR / "candidate_content.json"
-
-# Request settings
-TIMEOUT = 30
-USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-HEADERS = {"User-Agent": USER_AGENT}
-
-
-def fetch_url(url: str) -> str | None:
-    """Fetch HTML content from URL."""
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=TIMEOUT, allow_redirects=True)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        print(f"  Error fetching {url}: {e}")
-        return None
-
-
-def extract_text(html: str, url: str) -> str | None:
-    """Extract main text content from HTML using trafilatura."""
-    try:
-        text = trafilatura.extract(
-            html,
-            include_comments=False,
-            include_tables=True,
-            no_fallback=False,
-            favor_precision=False,
-            url=url
-        )
-        return text
-    except Exception as e:
-        print(f"  Error extracting text: {e}")
-        return None
-
-
-def scrape_cooperative(coop: dict, is_candidate: bool = False) -> dict:
-    """Scrape a single cooperative website."""
+# One JSON record per line, appended as each site finishes
+OUTPUT_FILE = DATA_DIR / "cooperative_content.jsonl"
+CANDIDATES_OUTPUT_FILE = DATA_DIR / "candidate_content.jsonl"
+# Output written before the switch to JSON Lines, still read for resuming
+LEGACY_OUTPUT_FILE = DATA_DIR / "cooperative_content.json"
+LEGACY_CANDIDATES_OUTPUT_FILE = DATA_DIR / "candidate_content.json"
+
+# Different hosts are scraped in parallel; requests to the same host stay
+# sequential (and fetch_url spaces them out)
+SCRAPE_WORKERS = 16
+
+
+def new_result(coop: dict, is_candidate: bool = False) -> dict:
+    """Output record for a cooperative, with no content yet."""
     result = {
         "name": coop["name"],
         "website": coop["website"],
@@ -78,7 +57,28 @@ def scrape_cooperative(coop: dict, is_candidate: bool = False) -> dict:
         result["category"] = coop.get("category")
         result["type"] = coop.get("type")
 
-    html = fetch_url(coop["website"])
+    return result
+
+
+def previous_content(output_file: Path, legacy_file: Path) -> dict:
+    """Successful results of an earlier run, by (name, website).
+
+    Falls back to the legacy .json output when there is no .jsonl yet.
+    """
+    if output_file.exists():
+        records = load_jsonl(output_file)
+    elif legacy_file.exists():
+        records = load_json(legacy_file)
+    else:
+        return {}
+    return {(r["name"], r["website"]): r for r in records if r["success"]}
+
+
+def scrape_cooperative(coop: dict, is_candidate: bool = False, refresh: bool = False) -> dict:
+    """Scrape a single cooperative website."""
+    result = new_result(coop, is_candidate)
+
+    html = fetch_url(coop["website"], refresh=refresh)
     if html:
         text = extract_text(html, coop["website"])
         if text and len(text.strip()) > 50:  # Minimum content threshold
@@ -89,47 +89,82 @@ def scrape_cooperative(coop: dict, is_candidate: bool = False) -> dict:
     return result
 
 
+def scrape_host(coops: list[dict], is_candidate: bool, refresh: bool, progress: tqdm) -> list[dict]:
+    """Scrape one host's cooperatives sequentially."""
+    results = []
+    for coop in coops:
+        results.append(scrape_cooperative(coop, is_candidate, refresh))
+        progress.update()
+    return results
+
+
 def main():
     """Main scraping pipeline."""
     parser = argparse.ArgumentParser(description="Scrape cooperative websites")
     parser.add_argument("--candidates", action="store_true", help="Scrape candidates instead of verified")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-scrape sites already in the output and re-download cached pages")
     args = parser.parse_args()
 
     if args.candidates:
         print("Loading candidates...")
-        with open(CANDIDATES_FILE) as f:
-            all_candidates = json.load(f)
+        all_candidates = load_json(CANDIDATES_FILE)
         # Filter to only candidates with websites
         cooperatives = [c for c in all_candidates if c.get("website") and not c.get("needs_website")]
         output_file = CANDIDATES_OUTPUT_FILE
+        legacy_file = LEGACY_CANDIDATES_OUTPUT_FILE
         is_candidate = True
         print(f"Found {len(cooperatives)} candidates with websites to scrape\n")
     else:
         print("Loading verified cooperatives...")
-        with open(COOPS_FILE) as f:
-            cooperatives = json.load(f)
+        cooperatives = load_json(COOPS_FILE)
         output_file = OUTPUT_FILE
+        legacy_file = LEGACY_OUTPUT_FILE
         is_candidate = False
         print(f"Found {len(cooperatives)} cooperatives to scrape\n")
 
-    results = []
+    # Carry over earlier successes; only new and failed sites are scraped
+    previous = {} if args.refresh else previous_content(output_file, legacy_file)
+    reused = []
+    by_host = defaultdict(list)
+    for coop in cooperatives:
+        earlier = previous.get((coop["name"], coop["website"]))
+        if earlier:
+            result = new_result(coop, is_candidate)
+            for field in ("content", "content_length", "success"):
+                result[field] = earlier[field]
+            reused.append(result)
+        else:
+            # Group by host so each server still sees one request at a time
+            by_host[extract_domain(coop["website"]) or coop["website"]].append(coop)
+    if reused:
+        print(f"Reusing {len(reused)} sites scraped by an earlier run")
+
+    # Results are written as they complete, so memory stays bounded and an
+    # interrupted run keeps what it scraped; only the stats are kept here
     successful = 0
-
-    # Process sequentially to be respectful of servers
-    for coop in tqdm(cooperatives, desc="Scraping websites"):
-        result = scrape_cooperative(coop, is_candidate)
-        results.append(result)
-
-        if result["success"]:
-            successful += 1
-
-        # Small delay between requests
-        time.sleep(0.5)
-
-    # Save results
-    print(f"\nSaving results to {output_file}")
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
+    content_lengths = []
+    failures = []
+    print(f"Writing results to {output_file}")
+
+    def record(results):
+        nonlocal successful
+        for result in results:
+            out.write(dumps_line(result))
+            if result["success"]:
+                successful += 1
+                content_lengths.append(result["content_length"])
+            else:
+                failures.append(result)
+        out.flush()
+
+    with open(output_file, "wb") as out, \
+            tqdm(total=len(cooperatives) - len(reused), desc="Scraping websites") as progress, \
+            ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as pool:
+        record(reused)
+        futures = [pool.submit(scrape_host, coops, is_candidate, args.refresh, progress) for coops in by_host.values()]
+        for future in as_completed(futures):
+            record(future.result())
 
     # Summary
     print(f"\n{'='*50}")
@@ -140,7 +175,6 @@ def main():
     print(f"Failed: {len(cooperatives) - successful}")
 
     # Content stats
-    content_lengths = [r["content_length"] for r in results if r["success"]]
     if content_lengths:
         print(f"\nContent statistics:")
         print(f"  Average length: {sum(content_lengths) // len(content_lengths):,} chars")
@@ -148,7 +182,6 @@ def main():
         print(f"  Max length: {max(content_lengths):,} chars")
 
     # List failures
-    failures = [r for r in results if not r["success"]]
     if failures:
         print(f"\nFailed sites:")
         for fail in failures:
@@ -2,28 +2,45 @@
 """
 Similarity search for finding cooperative-like businesses.
 Compares candidate websites against verified cooperative embeddings.
+
+Usage:
+    python similarity_search.py                 # Fetch and score candidates
+    python similarity_search.py --from-content  # Score pages already fetched by
+                                                # scrape_websites.py --candidates
 """
 
-import json
+import os
 import pickle
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
-import requests
-import trafilatura
-from sentence_transformers import SentenceTransformer
+
+# FAISS has faster (SIMD, multithreaded) exact top-k search than NumPy;
+# fall back to argpartition when it isn't installed.
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+from coop_utils import load_json, load_jsonl, save_json
+from generate_embeddings import encode_length_bucketed, load_model, max_content_chars
+from scrape_core import extract_text, fetch_url
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 MODELS_DIR = Path(__file__).parent.parent / "models"
-EMBEDDINGS_FILE = MODELS_DIR / "cooperative_embeddings.pkl"
+EMBEDDINGS_FILE = MODELS_DIR / "cooperative_embeddings.npy"
+EMBEDDINGS_META_FILE = MODELS_DIR / "cooperative_embeddings_meta.json"
+LEGACY_EMBEDDINGS_FILE = MODELS_DIR / "cooperative_embeddings.pkl"
 CANDIDATES_FILE = DATA_DIR / "candidates.json"
+# Written by scrape_websites.py --candidates
+CANDIDATE_CONTENT_FILE = DATA_DIR / "candidate_content.jsonl"
 RESULTS_FILE = DATA_DIR / "similarity_results.json"
 
-# Request settings
-TIMEOUT = 30
-USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-HEADERS = {"User-Agent": USER_AGENT}
+# Candidate websites fetched at once
+FETCH_WORKERS = 16
 
 
 class CooperativeSimilaritySearch:
@@ -34,64 +51,131 @@ class CooperativeSimilaritySearch:
         self.model = None
         self.embeddings = None
         self.cooperatives = None
+        self.centroid = None
+        self.index = None
+        self.max_content_chars = 10000
 
     def load(self):
         """Load embeddings and model."""
         print("Loading embeddings...")
-        with open(EMBEDDINGS_FILE, "rb") as f:
-            self.embeddings_data = pickle.load(f)
+        if EMBEDDINGS_FILE.exists():
+            self.embeddings_data = load_json(EMBEDDINGS_META_FILE)
+            self.embeddings = np.load(EMBEDDINGS_FILE, mmap_mode="r")
+        else:
+            # Embeddings generated before the .npy format; converted once so
+            # later runs load the .npy instead of unpickling
+            with open(LEGACY_EMBEDDINGS_FILE, "rb") as f:
+                self.embeddings_data = pickle.load(f)
+            self.embeddings = self.embeddings_data.pop("embeddings")
+            self.embeddings_data["embedding_dim"] = int(self.embeddings.shape[1])
+            print(f"Converting {LEGACY_EMBEDDINGS_FILE.name} to {EMBEDDINGS_FILE.name}")
+            # The .npy marks a finished conversion, so it is written last and
+            # atomically; if anything fails, the next load simply converts again
+            save_json(self.embeddings_data, EMBEDDINGS_META_FILE)
+            tmp = EMBEDDINGS_FILE.with_name(f".{EMBEDDINGS_FILE.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, np.asarray(self.embeddings, dtype=np.float16))
+            os.replace(tmp, EMBEDDINGS_FILE)
+
+        # Widen (the .npy is float16) to one contiguous float32 matrix, so
+        # similarity products go straight to BLAS sgemm. Integer matrix
+        # products in NumPy don't use BLAS (and int8 @ int8 overflows), so
+        # quantizing further would make scoring slower, not faster.
+        self.embeddings = np.ascontiguousarray(self.embeddings, dtype=np.float32)
+        self.build_index()
 
-        self.embeddings = self.embeddings_data["embeddings"]
         self.cooperatives = self.embeddings_data["cooperatives"]
 
         print(f"Loading model: {self.embeddings_data['model_name']}")
-        self.model = SentenceTransformer(self.embeddings_data["model_name"])
+        # Same device / precision choice as generate_embeddings
+        self.model = load_model(self.embeddings_data["model_name"])
+        self.max_content_chars = max_content_chars(self.model)
 
         print(f"Loaded {len(self.cooperatives)} cooperative embeddings")
 
     def fetch_and_extract(self, url: str) -> str | None:
         """Fetch URL and extract text content."""
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=TIMEOUT, allow_redirects=True)
-            response.raise_for_status()
-            text = trafilatura.extract(response.text, url=url)
-            return text
-        except Exception as e:
-            print(f"  Error fetching {url}: {e}")
+        # Same fetch and extraction settings as the scraped training content
+        html = fetch_url(url)
+        if html is None:
             return None
+        return extract_text(html, url)
 
     def create_embedding_text(self, name: str, location: str, content: str) -> str:
         """Create text for embedding."""
         parts = [f"{name}", f"Location: {location}"]
         if content:
-            parts.append(content[:10000])
+            parts.append(content[:self.max_content_chars])
         return "\n\n".join(parts)
 
     def compute_similarity(self, candidate_embedding: np.ndarray) -> dict:
         """Compute similarity scores against all verified cooperatives."""
-        # Cosine similarity (embeddings are normalized)
-        similarities = np.dot(self.embeddings, candidate_embedding)
+        return self.compute_similarity_batch(candidate_embedding[np.newaxis])[0]
+
+    def build_index(self):
+        """Precompute what scoring needs from the embedding matrix."""
+        # The mean cosine similarity to all cooperatives is the dot product
+        # with their mean embedding, so it needs no full similarity matrix
+        self.centroid = self.embeddings.mean(axis=0)
+        if faiss is not None:
+            self.index = faiss.IndexFlatIP(self.embeddings.shape[1])
+            self.index.add(self.embeddings)
+
+    def top_k(self, candidate_embeddings: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k cosine similarities and indices per candidate, best first."""
+        if self.index is not None:
+            return self.index.search(candidate_embeddings, k)
+
+        # Cosine similarity (embeddings are normalized) of every candidate
+        # with every verified cooperative, as one matrix product.
+        # argpartition finds each row's top k in linear time; only those k
+        # are then sorted.
+        similarities = candidate_embeddings @ self.embeddings.T
+        top_indices = np.argpartition(similarities, -k, axis=1)[:, -k:]
+        top_similarities = np.take_along_axis(similarities, top_indices, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        return (
+            np.take_along_axis(top_similarities, order, axis=1),
+            np.take_along_axis(top_indices, order, axis=1),
+        )
+
+    def compute_similarity_batch(self, candidate_embeddings: np.ndarray) -> list[dict]:
+        """Compute similarity scores for each row of a candidate embedding matrix."""
+        candidate_embeddings = np.ascontiguousarray(candidate_embeddings, dtype=np.float32)
 
         # Overall score (mean of top-k similarities)
-        top_k = 5
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-
-        return {
-            "mean_similarity": float(np.mean(similarities)),
-            "max_similarity": float(np.max(similarities)),
-            "top_k_mean": float(np.mean(similarities[top_indices])),
-            "most_similar": [
-                {
-                    "name": self.cooperatives[i]["name"],
-                    "category": self.cooperatives[i]["category"],
-                    "similarity": float(similarities[i])
-                }
-                for i in top_indices
-            ]
-        }
+        top_similarities, top_indices = self.top_k(candidate_embeddings, min(5, len(self.embeddings)))
+        mean_similarities = candidate_embeddings @ self.centroid
 
-    def score_candidate(self, candidate: dict) -> dict:
-        """Score a single candidate business."""
+        return [
+            {
+                "mean_similarity": float(mean_similarities[j]),
+                "max_similarity": float(top_similarities[j, 0]),
+                "top_k_mean": float(top_similarities[j].mean()),
+                "most_similar": [
+                    {
+                        "name": self.cooperatives[i]["name"],
+                        "category": self.cooperatives[i]["category"],
+                        "similarity": float(similarity)
+                    }
+                    for i, similarity in zip(top_indices[j], top_similarities[j])
+                ]
+            }
+            for j in range(len(candidate_embeddings))
+        ]
+
+    def prepare_candidate(self, candidate: dict) -> tuple[dict, str | None]:
+        """Fetch a candidate's website and build its text for embedding."""
+        content = None
+        if candidate.get("website"):
+            content = self.fetch_and_extract(candidate["website"])
+        return self.build_candidate(candidate, content)
+
+    def build_candidate(self, candidate: dict, content: str | None) -> tuple[dict, str | None]:
+        """Build a candidate's (unscored) result and its text for embedding.
+
+        The text is None when there is no content.
+        """
         result = {
             "name": candidate["name"],
             "website": candidate.get("website"),
@@ -102,34 +186,62 @@ class CooperativeSimilaritySearch:
             "cooperative_score": 0.0
         }
 
-        # Fetch and extract content
-        if candidate.get("website"):
-            content = self.fetch_and_extract(candidate["website"])
-            if content:
-                result["content_extracted"] = True
-                result["content_preview"] = content[:500] + "..." if len(content) > 500 else content
-
-                # Generate embedding
-                text = self.create_embedding_text(
-                    candidate["name"],
-                    candidate.get("location", "Iowa"),
-                    content
-                )
-                embedding = self.model.encode(text, normalize_embeddings=True)
-
-                # Compute similarities
-                result["similarity_scores"] = self.compute_similarity(embedding)
-                result["cooperative_score"] = result["similarity_scores"]["top_k_mean"]
+        if content:
+            result["content_extracted"] = True
+            result["content_preview"] = content[:500] + "..." if len(content) > 500 else content
+
+            text = self.create_embedding_text(
+                candidate["name"],
+                candidate.get("location", "Iowa"),
+                content
+            )
+            return result, text
+
+        return result, None
+
+    def finalize(self, result: dict, scores: dict) -> dict:
+        """Fill in a prepared result's similarity scores."""
+        result["similarity_scores"] = scores
+        result["cooperative_score"] = scores["top_k_mean"]
+        return result
 
+    def score_candidate(self, candidate: dict) -> dict:
+        """Score a single candidate business."""
+        result, text = self.prepare_candidate(candidate)
+        if text is not None:
+            embedding = self.model.encode(text, normalize_embeddings=True)
+            self.finalize(result, self.compute_similarity(embedding))
         return result
 
-    def score_candidates(self, candidates: list[dict]) -> list[dict]:
-        """Score multiple candidates and rank by similarity."""
-        results = []
+    def score_candidates(self, candidates: list[dict], contents: dict | None = None) -> list[dict]:
+        """Score multiple candidates and rank by similarity.
+
+        contents maps (name, website) to already-fetched page text; without
+        it the candidates' websites are fetched here.
+        """
+        # Fetch concurrently, then embed every extracted text in length-sorted
+        # batches rather than one forward pass per candidate
+        if contents is None:
+            print(f"Fetching {len(candidates)} candidate websites...")
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+                prepared = list(executor.map(self.prepare_candidate, candidates))
+        else:
+            prepared = [
+                self.build_candidate(c, contents.get((c["name"], c.get("website"))))
+                for c in candidates
+            ]
 
-        for i, candidate in enumerate(candidates):
-            print(f"\n[{i+1}/{len(candidates)}] Scoring: {candidate['name']}")
-            result = self.score_candidate(candidate)
+        texts = [text for _, text in prepared if text is not None]
+        print(f"Embedding {len(texts)} candidates with content...")
+        scores = iter(self.compute_similarity_batch(
+            encode_length_bucketed(self.model, texts)
+        ) if texts else [])
+
+        results = []
+        for i, (result, text) in enumerate(prepared):
+            print(f"\n[{i+1}/{len(candidates)}] Scoring: {result['name']}")
+            if text is not None:
+                self.finalize(result, next(scores))
             results.append(result)
 
             if result["content_extracted"]:
@@ -148,6 +260,11 @@ class CooperativeSimilaritySearch:
 
 def main():
     """Run similarity search on candidate businesses."""
+    parser = argparse.ArgumentParser(description="Score candidates by similarity to verified cooperatives")
+    parser.add_argument("--from-content", action="store_true",
+                        help=f"Use pages already fetched into {CANDIDATE_CONTENT_FILE.name} instead of fetching")
+    args = parser.parse_args()
+
     # Check for candidates file
     if not CANDIDATES_FILE.exists():
         print(f"No candidates file found at {CANDIDATES_FILE}")
@@ -162,8 +279,7 @@ def main():
                 "source": "example"
             }
         ]
-        with open(CANDIDATES_FILE, "w") as f:
-            json.dump(example_candidates, f, indent=2)
+        save_json(example_candidates, CANDIDATES_FILE)
 
         print(f"Created {CANDIDATES_FILE}")
         print("Add candidate businesses to this file and run again.")
@@ -171,11 +287,22 @@ def main():
 
     # Load candidates
     print("Loading candidates...")
-    with open(CANDIDATES_FILE) as f:
-        candidates = json.load(f)
+    candidates = load_json(CANDIDATES_FILE)
 
     print(f"Found {len(candidates)} candidates to score\n")
 
+    contents = None
+    if args.from_content:
+        if not CANDIDATE_CONTENT_FILE.exists():
+            print(f"No content file found at {CANDIDATE_CONTENT_FILE}")
+            print("Run scrape_websites.py --candidates first.")
+            return
+        contents = {
+            (r["name"], r["website"]): r["content"]
+            for r in load_jsonl(CANDIDATE_CONTENT_FILE) if r["success"]
+        }
+        print(f"Loaded fetched content for {len(contents)} candidates\n")
+
     # Initialize search
     search = CooperativeSimilaritySearch()
     search.load()
@@ -185,12 +312,11 @@ def main():
     print("SCORING CANDIDATES")
     print("="*50)
 
-    results = search.score_candidates(candidates)
+    results = search.score_candidates(candidates, contents)
 
     # Save results
     print(f"\nSaving results to {RESULTS_FILE}")
-    with open(RESULTS_FILE, "w") as f:
-        json.dump(results, f, indent=2)
+    save_json(results, RESULTS_FILE)
 
     # Summary
     print("\n" + "="*50)
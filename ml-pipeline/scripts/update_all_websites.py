@@ -3,10 +3,11 @@
 Update all cooperatives with discovered websites from research.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+from coop_utils import load_json, save_json
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 
@@ -194,16 +195,19 @@ WEBSITES = {
 
 def normalize_name(name: str) -> str:
     """Normalize name for matching."""
+    # Chained replace() beats str.translate here: replace returns the string
+    # itself when there is nothing to remove, while translate's deletion
+    # path builds a new string character by character (several times slower)
     return name.lower().strip().replace(",", "").replace(".", "")
 
 
+# WEBSITES by normalized name, built once at import
+WEBSITE_LOOKUP = {normalize_name(k): v for k, v in WEBSITES.items()}
+
+
 def main():
     print("Loading labeled data...")
-    with open(LABELED_DATA_PATH) as f:
-        data = json.load(f)
-
-    # Create lookup by normalized name
-    website_lookup = {normalize_name(k): v for k, v in WEBSITES.items()}
+    data = load_json(LABELED_DATA_PATH)
 
     updated = 0
     already_had = 0
@@ -214,23 +218,26 @@ def main():
             already_had += 1
             continue
 
-        norm_name = normalize_name(coop['name'])
-        if norm_name in website_lookup:
-            coop['website'] = website_lookup[norm_name]
+        website = WEBSITE_LOOKUP.get(normalize_name(coop['name']))
+        if website:
+            coop['website'] = website
             updated += 1
             print(f"  Updated: {coop['name']}")
         else:
             not_found += 1
 
-    data['metadata']['last_updated'] = datetime.now().isoformat()
-
-    print(f"\nSaving to {LABELED_DATA_PATH}...")
-    with open(LABELED_DATA_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Only rewrite (and touch last_updated) when something changed
+    if updated:
+        data['metadata']['last_updated'] = datetime.now().isoformat()
+        print(f"\nSaving to {LABELED_DATA_PATH}...")
+        save_json(data, LABELED_DATA_PATH)
+    else:
+        print("\nNo updates needed; skipping write.")
 
-    # Count final stats
-    with_website = len([c for c in data['verified_cooperatives'] if c.get('website')])
-    without_website = len([c for c in data['verified_cooperatives'] if not c.get('website')])
+    # Final stats, from the counts kept in the loop above
+    total = len(data['verified_cooperatives'])
+    with_website = already_had + updated
+    without_website = total - with_website
 
     print()
     print("=" * 60)
@@ -242,7 +249,7 @@ def main():
     print()
     print(f"Total with website: {with_website}")
     print(f"Total without website: {without_website}")
-    print(f"Coverage: {with_website}/{len(data['verified_cooperatives'])} ({100*with_website/len(data['verified_cooperatives']):.1f}%)")
+    print(f"Coverage: {with_website}/{total} ({100*with_website/total:.1f}%)")
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@
 Update credit union candidates with discovered websites.
 """
 
-import json
 from pathlib import Path
 
+from coop_utils import load_json, save_json
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 CANDIDATES_FILE = DATA_DIR / "candidates.json"
 
@@ -84,8 +85,7 @@ CREDIT_UNION_WEBSITES = {
 
 def main():
     print("Loading candidates...")
-    with open(CANDIDATES_FILE) as f:
-        candidates = json.load(f)
+    candidates = load_json(CANDIDATES_FILE)
 
     updated_count = 0
     still_need_websites = 0
@@ -105,9 +105,11 @@ def main():
             else:
                 still_need_websites += 1
 
-    print(f"\nSaving updated candidates...")
-    with open(CANDIDATES_FILE, 'w') as f:
-        json.dump(candidates, f, indent=2)
+    if updated_count:
+        print(f"\nSaving updated candidates...")
+        save_json(candidates, CANDIDATES_FILE)
+    else:
+        print("\nNo updates needed; skipping write.")
 
     print(f"\n{'='*50}")
     print(f"SUMMARY")
@@ -117,7 +119,7 @@ def main():
     print(f"Total candidates: {len(candidates)}")
 
     # Count candidates ready for ML
-    ready_for_ml = len([c for c in candidates if c.get('website') and not c.get('needs_website')])
+    ready_for_ml = sum(1 for c in candidates if c.get('website') and not c.get('needs_website'))
     print(f"\nReady for ML scoring: {ready_for_ml}")
 
 
@@ -14,11 +14,15 @@ Options:
     --min-score S   Minimum similarity score to consider (default: 0.4)
 """
 
-import json
+import heapq
 import argparse
 import webbrowser
 from datetime import datetime
 from pathlib import Path
+from collections import Counter
+from operator import itemgetter
+
+from coop_utils import load_json, save_json
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -26,38 +30,39 @@ LABELED_DATA_PATH = DATA_DIR / "labeled_data.json"
 SIMILARITY_RESULTS_PATH = DATA_DIR / "similarity_results.json"
 
 
-def load_json(path):
-    """Load JSON file."""
-    with open(path, 'r') as f:
-        return json.load(f)
-
+def get_reviewed_websites(labeled_data):
+    """Get the set of websites already verified or rejected."""
+    return (
+        {coop['website'] for coop in labeled_data['verified_cooperatives']}
+        | {candidate['website'] for candidate in labeled_data['rejected_candidates']}
+    )
 
-def save_json(data, path):
-    """Save JSON file with pretty formatting."""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
 
+def get_unreviewed_candidates(reviewed_websites, similarity_results, min_score=0.4, limit=None):
+    """Get candidates that haven't been reviewed yet, sorted by score.
 
-def get_unreviewed_candidates(labeled_data, similarity_results, min_score=0.4):
-    """Get candidates that haven't been reviewed yet, sorted by score."""
-    # Get already reviewed websites
-    reviewed_websites = set()
-    for coop in labeled_data['verified_cooperatives']:
-        reviewed_websites.add(coop['website'])
-    for candidate in labeled_data['rejected_candidates']:
-        reviewed_websites.add(candidate['website'])
-
+    Returns how many there are and the top `limit` of them (all if None).
+    """
     # Filter to unreviewed candidates with sufficient score
     unreviewed = []
     for candidate in similarity_results:
         if candidate['website'] not in reviewed_websites:
-            score = candidate.get('cooperative_score', 0)
+            # Filled in here so the sort below can use a plain itemgetter
+            score = candidate.setdefault('cooperative_score', 0)
             if score >= min_score:
                 unreviewed.append(candidate)
 
-    # Sort by cooperative_score descending
-    unreviewed.sort(key=lambda x: x.get('cooperative_score', 0), reverse=True)
-    return unreviewed
+    # Top candidates by cooperative_score, descending; nlargest only keeps
+    # `limit` of them in its heap rather than sorting the whole list
+    key = itemgetter('cooperative_score')
+    if limit is None:
+        return len(unreviewed), sorted(unreviewed, key=key, reverse=True)
+    return len(unreviewed), heapq.nlargest(limit, unreviewed, key=key)
+
+
+def get_most_similar(candidate):
+    """Get a candidate's closest verified cooperatives (empty if unscored)."""
+    return (candidate.get('similarity_scores') or {}).get('most_similar') or []
 
 
 def display_candidate(candidate, index, total):
@@ -74,9 +79,10 @@ def display_candidate(candidate, index, total):
     print(f"\nSimilarity Score: {score:.3f}")
 
     # Show most similar cooperatives
-    if candidate.get('similarity_scores') and candidate['similarity_scores'].get('most_similar'):
+    most_similar = get_most_similar(candidate)
+    if most_similar:
         print("\nMost similar to:")
-        for similar in candidate['similarity_scores']['most_similar'][:3]:
+        for similar in most_similar[:3]:
             print(f"  - {similar['name']} ({similar['category']}): {similar['similarity']:.3f}")
 
     # Show content preview
@@ -84,10 +90,9 @@ def display_candidate(candidate, index, total):
     if preview:
         print(f"\nContent preview:")
         print("-" * 40)
-        # Truncate and clean up preview
+        # Truncate and clean up preview, printed as one block
         preview_lines = preview[:500].split('\n')
-        for line in preview_lines[:8]:
-            print(f"  {line.strip()}")
+        print("\n".join(f"  {line.strip()}" for line in preview_lines[:8]))
         if len(preview) > 500:
             print("  ...")
 
@@ -114,18 +119,13 @@ def get_user_decision():
 
 def determine_category(candidate):
     """Try to determine the category based on similarity matches."""
-    if candidate.get('similarity_scores') and candidate['similarity_scores'].get('most_similar'):
-        # Count categories from top matches
-        category_counts = {}
-        for similar in candidate['similarity_scores']['most_similar']:
-            cat = similar.get('category', 'other')
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-
-        # Return most common category
-        if category_counts:
-            return max(category_counts, key=category_counts.get)
+    most_similar = get_most_similar(candidate)
+    if not most_similar:
+        return 'other'
 
-    return 'other'
+    # Most common category among the top matches (first seen wins ties)
+    category_counts = Counter(similar.get('category', 'other') for similar in most_similar)
+    return category_counts.most_common(1)[0][0]
 
 
 def update_stats(labeled_data, verified_count, rejected_count):
@@ -160,80 +160,96 @@ def main():
     labeled_data = load_json(LABELED_DATA_PATH)
     similarity_results = load_json(SIMILARITY_RESULTS_PATH)
 
-    # Get unreviewed candidates
-    candidates = get_unreviewed_candidates(labeled_data, similarity_results, args.min_score)
+    # Get unreviewed candidates; the reviewed set is kept up to date below
+    reviewed_websites = get_reviewed_websites(labeled_data)
+    found, candidates = get_unreviewed_candidates(
+        reviewed_websites, similarity_results, args.min_score, args.num
+    )
 
-    if not candidates:
+    if not found:
         print("\nNo unreviewed candidates found with score >= {:.2f}".format(args.min_score))
         print("Try lowering --min-score or running similarity_search.py with new candidates.")
         return
 
-    num_to_review = min(args.num, len(candidates))
-    print(f"\nFound {len(candidates)} unreviewed candidates (score >= {args.min_score})")
+    num_to_review = len(candidates)
+    print(f"\nFound {found} unreviewed candidates (score >= {args.min_score})")
     print(f"Will review up to {num_to_review} candidates.\n")
 
     # Review loop
+    next_id = max((c['id'] for c in labeled_data['verified_cooperatives']), default=0) + 1
     verified_count = 0
     rejected_count = 0
     skipped_count = 0
 
-    for i, candidate in enumerate(candidates[:num_to_review]):
-        display_candidate(candidate, i, num_to_review)
-
-        while True:
-            decision = get_user_decision()
-
-            if decision == 'o':
-                # Open website in browser
-                print(f"Opening {candidate['website']}...")
-                webbrowser.open(candidate['website'])
+    # Decisions made so far are still saved if the session is cut short
+    try:
+        for i, candidate in enumerate(candidates):
+            if candidate['website'] in reviewed_websites:
+                # Same website as a candidate decided earlier in this session
+                print(f"\nAlready reviewed {candidate['website']} this session, skipping")
                 continue
-            elif decision == 'y':
-                # Add to verified cooperatives
-                category = determine_category(candidate)
-                print(f"\nInferred category: {category}")
-                custom_cat = input("Press Enter to accept or type a different category: ").strip()
-                if custom_cat:
-                    category = custom_cat
-
-                new_coop = {
-                    'id': max(c['id'] for c in labeled_data['verified_cooperatives']) + 1,
-                    'name': candidate['name'],
-                    'category': category,
-                    'website': candidate['website'],
-                    'location': candidate.get('location', 'Iowa'),
-                    'verified_date': datetime.now().isoformat(),
-                    'source': 'ml_pipeline',
-                    'similarity_score': candidate.get('cooperative_score', 0)
-                }
-                labeled_data['verified_cooperatives'].append(new_coop)
-                verified_count += 1
-                print(f"Added '{candidate['name']}' as verified cooperative (category: {category})")
-                break
-            elif decision == 'n':
-                # Add to rejected
-                rejected = {
-                    'name': candidate['name'],
-                    'website': candidate['website'],
-                    'location': candidate.get('location', 'Unknown'),
-                    'rejected_date': datetime.now().isoformat(),
-                    'similarity_score': candidate.get('cooperative_score', 0),
-                    'reason': 'not_cooperative'
-                }
-                labeled_data['rejected_candidates'].append(rejected)
-                rejected_count += 1
-                print(f"Rejected '{candidate['name']}'")
-                break
-            elif decision == 's':
-                skipped_count += 1
-                print("Skipped")
-                break
-            elif decision == 'q':
-                print("\nQuitting review session...")
-                break
 
-        if decision == 'q':
-            break
+            display_candidate(candidate, i, num_to_review)
+
+            while True:
+                decision = get_user_decision()
+
+                if decision == 'o':
+                    # Open website in browser
+                    print(f"Opening {candidate['website']}...")
+                    webbrowser.open(candidate['website'])
+                    continue
+                elif decision == 'y':
+                    # Add to verified cooperatives
+                    category = determine_category(candidate)
+                    print(f"\nInferred category: {category}")
+                    custom_cat = input("Press Enter to accept or type a different category: ").strip()
+                    if custom_cat:
+                        category = custom_cat
+
+                    new_coop = {
+                        'id': next_id,
+                        'name': candidate['name'],
+                        'category': category,
+                        'website': candidate['website'],
+                        'location': candidate.get('location', 'Iowa'),
+                        'verified_date': datetime.now().isoformat(),
+                        'source': 'ml_pipeline',
+                        'similarity_score': candidate.get('cooperative_score', 0)
+                    }
+                    labeled_data['verified_cooperatives'].append(new_coop)
+                    reviewed_websites.add(candidate['website'])
+                    next_id += 1
+                    verified_count += 1
+                    print(f"Added '{candidate['name']}' as verified cooperative (category: {category})")
+                    break
+                elif decision == 'n':
+                    # Add to rejected
+                    rejected = {
+                        'name': candidate['name'],
+                        'website': candidate['website'],
+                        'location': candidate.get('location', 'Unknown'),
+                        'rejected_date': datetime.now().isoformat(),
+                        'similarity_score': candidate.get('cooperative_score', 0),
+                        'reason': 'not_cooperative'
+                    }
+                    labeled_data['rejected_candidates'].append(rejected)
+                    reviewed_websites.add(candidate['website'])
+                    rejected_count += 1
+                    print(f"Rejected '{candidate['name']}'")
+                    break
+                elif decision == 's':
+                    skipped_count += 1
+                    print("Skipped")
+                    break
+                elif decision == 'q':
+                    print("\nQuitting review session...")
+                    break
+
+            if decision == 'q':
+                break
+    except (KeyboardInterrupt, EOFError):
+        print("\n\nReview interrupted, saving decisions so far...")
 
     # Update stats and save
     update_stats(labeled_data, verified_count, rejected_count)
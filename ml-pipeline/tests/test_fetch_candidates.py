@@ -0,0 +1,60 @@
+"""Tests for candidate deduplication in fetch_candidates.py.
+
+Run from ml-pipeline/:
+    python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from fetch_candidates import deduplicate_candidates  # noqa: E402
+
+
+def kept_names(candidates):
+    return [c['name'] for c in deduplicate_candidates(candidates, frozenset())]
+
+
+class DeduplicateCandidatesTest(unittest.TestCase):
+    def test_keeps_different_organisation_types(self):
+        candidates = [
+            {"name": "Hawkeye Cooperative", "website": "https://a.com", "location": "Iowa"},
+            {"name": "Hawkeye Credit Union", "website": "https://b.com", "location": "Iowa"},
+        ]
+        self.assertEqual(kept_names(candidates), ["Hawkeye Cooperative", "Hawkeye Credit Union"])
+
+    def test_keeps_different_utilities(self):
+        candidates = [
+            {"name": "Heartland Electric Cooperative", "website": None, "location": "Iowa"},
+            {"name": "Heartland Telephone Company", "website": None, "location": "Iowa"},
+        ]
+        self.assertEqual(
+            kept_names(candidates), ["Heartland Electric Cooperative", "Heartland Telephone Company"]
+        )
+
+    def test_merges_abbreviated_name(self):
+        candidates = [
+            {"name": "Veridian CU", "website": "https://www.veridiancu.org/", "location": "Waterloo, IA"},
+            {"name": "Veridian Credit Union", "website": None, "location": "Waterloo, IA"},
+        ]
+        self.assertEqual(kept_names(candidates), ["Veridian CU"])
+
+    def test_keeps_same_name_with_different_website(self):
+        candidates = [
+            {"name": "Veridian CU", "website": "https://a.com", "location": "Waterloo, IA"},
+            {"name": "Veridian Credit Union", "website": "https://b.com", "location": "Waterloo, IA"},
+        ]
+        self.assertEqual(kept_names(candidates), ["Veridian CU", "Veridian Credit Union"])
+
+    def test_iowa_is_not_a_wildcard_location(self):
+        candidates = [
+            {"name": "Veridian CU", "website": None, "location": "Waterloo, IA"},
+            {"name": "Veridian Credit Union", "website": None, "location": "Iowa"},
+        ]
+        self.assertEqual(kept_names(candidates), ["Veridian CU", "Veridian Credit Union"])
+
+
+if __name__ == '__main__':
+    unittest.main()